@@ -1,10 +1,80 @@
+from django import forms
 from django.contrib import admin
+from django.http import StreamingHttpResponse
+from django.urls import reverse
+from django.utils.html import format_html
 
+from .cache import bump_post_card_generation, purge_pages
+from .exports import FORMATS, export_lines
 from .models import Post, Category, Location, Comment
+from .paginators import EstimatedCountPaginator
+from .search import search_posts
+
+
+class LargeChangeListMixin:
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    def formfield_for_foreignkey(self, db_field, request, **kwargs):
+        if (db_field.name not in self.list_editable
+                or not request.resolver_match.url_name.endswith('changelist')):
+            return super().formfield_for_foreignkey(
+                db_field, request, **kwargs
+            )
+        kwargs['widget'] = forms.Select
+        field = super().formfield_for_foreignkey(db_field, request, **kwargs)
+        if not hasattr(request, 'admin_choices'):
+            request.admin_choices = {}
+        if db_field.name not in request.admin_choices:
+            request.admin_choices[db_field.name] = list(field.choices)
+        field.choices = request.admin_choices[db_field.name]
+        return field
+
+
+class PublishActionsMixin:
+    actions = ('publish', 'unpublish')
+
+    @admin.action(description='Опубликовать выбранные')
+    def publish(self, request, queryset):
+        self.set_published(request, queryset, True)
+
+    @admin.action(description='Снять с публикации выбранные')
+    def unpublish(self, request, queryset):
+        self.set_published(request, queryset, False)
+
+    def set_published(self, request, queryset, is_published):
+        ids = list(queryset.values_list('pk', flat=True))
+        updated = (
+            self.model.objects
+            .filter(pk__in=ids)
+            .update(is_published=is_published)
+        )
+        self.refresh_posts(ids)
+        bump_post_card_generation()
+        purge_pages()
+        self.message_user(request, f'Изменено записей: {updated}')
+
+    def refresh_posts(self, ids):
+        pass
+
+
+class RelatedPostsMixin:
+    related_post_field = None
+
+    @admin.display(description='Публикации')
+    def related_posts(self, obj):
+        if obj.pk is None:
+            return '-'
+        url = reverse('admin:blog_post_changelist')
+        total = Post.objects.filter(**{self.related_post_field: obj}).count()
+        return format_html(
+            '<a href="{}?{}__id__exact={}">Публикаций: {}</a>',
+            url, self.related_post_field, obj.pk, total
+        )
 
 
 @admin.register(Comment)
-class CommentAdmin(admin.ModelAdmin):
+class CommentAdmin(LargeChangeListMixin, admin.ModelAdmin):
     list_display = (
         'text',
         'is_published',
@@ -13,15 +83,24 @@ class CommentAdmin(admin.ModelAdmin):
     list_editable = (
         'is_published',
     )
+    list_select_related = (
+        'author',
+        'post',
+    )
+    autocomplete_fields = (
+        'author',
+        'post',
+    )
 
 
 class CommentInline(admin.StackedInline):
     model = Comment
     extra = 0
+    autocomplete_fields = ('author',)
 
 
 @admin.register(Post)
-class PostAdmin(admin.ModelAdmin):
+class PostAdmin(LargeChangeListMixin, PublishActionsMixin, admin.ModelAdmin):
     inlines = (
         CommentInline,
     )
@@ -38,21 +117,57 @@ class PostAdmin(admin.ModelAdmin):
         'is_published',
         'category'
     )
-    search_fields = ('title',)
-    list_filter = ('category',)
+    list_select_related = (
+        'author',
+        'category',
+        'location',
+    )
+    autocomplete_fields = (
+        'author',
+        'category',
+        'location',
+    )
+    readonly_fields = ('comment_count', 'is_visible')
+    search_fields = ('title', 'text')
+    list_filter = ('category', 'location')
     list_display_links = ('title',)
+    actions = ('publish', 'unpublish', 'export_jsonl', 'export_csv')
 
+    def set_published(self, request, queryset, is_published):
+        updated = queryset.set_published(is_published)
+        bump_post_card_generation()
+        purge_pages()
+        self.message_user(request, f'Изменено записей: {updated}')
 
-class PostInline(admin.StackedInline):
-    model = Post
-    extra = 0
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term:
+            return queryset, False
+        return search_posts(queryset, search_term), False
+
+    def export(self, queryset, export_format):
+        _, content_type = FORMATS[export_format]
+        response = StreamingHttpResponse(
+            export_lines('post', export_format, queryset=queryset),
+            content_type=content_type
+        )
+        response['Content-Disposition'] = (
+            f'attachment; filename="posts.{export_format}"'
+        )
+        return response
+
+    @admin.action(description='Выгрузить в JSONL')
+    def export_jsonl(self, request, queryset):
+        return self.export(queryset, 'jsonl')
+
+    @admin.action(description='Выгрузить в CSV')
+    def export_csv(self, request, queryset):
+        return self.export(queryset, 'csv')
 
 
 @admin.register(Category)
-class CategoryAdmin(admin.ModelAdmin):
-    inlines = (
-        PostInline,
-    )
+class CategoryAdmin(PublishActionsMixin, RelatedPostsMixin, admin.ModelAdmin):
+    related_post_field = 'category'
+    readonly_fields = ('related_posts',)
     list_display = (
         'title',
         'is_published',
@@ -64,12 +179,14 @@ class CategoryAdmin(admin.ModelAdmin):
     )
     search_fields = ('title',)
 
+    def refresh_posts(self, ids):
+        Post.objects.filter(category_id__in=ids).refresh_visibility()
+
 
 @admin.register(Location)
-class LocationAdmin(admin.ModelAdmin):
-    inlines = (
-        PostInline,
-    )
+class LocationAdmin(PublishActionsMixin, RelatedPostsMixin, admin.ModelAdmin):
+    related_post_field = 'location'
+    readonly_fields = ('related_posts',)
     list_display = (
         'name',
         'is_published',
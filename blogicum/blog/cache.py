@@ -0,0 +1,86 @@
+import hashlib
+import time
+
+from django.core.cache import cache
+from django.utils import timezone as tz
+
+from .models import Post
+
+POST_CARD_GENERATION_KEY = 'blog:post_card:generation'
+PAGE_GENERATION_KEY = 'blog:page:generation'
+NEXT_PUBLICATION_KEY = 'blog:page:next_publication'
+
+
+def get_generation(key):
+    generation = cache.get(key)
+    if generation is None:
+        cache.add(key, time.time_ns(), None)
+        generation = cache.get(key)
+    return generation
+
+
+def bump_generation(key):
+    cache.set(key, max(time.time_ns(), get_generation(key) + 1), None)
+
+
+def get_post_card_generation():
+    return get_generation(POST_CARD_GENERATION_KEY)
+
+
+def bump_post_card_generation():
+    bump_generation(POST_CARD_GENERATION_KEY)
+
+
+def post_card_key(post_id, generation):
+    return f'blog:post_card:{generation}:{post_id}'
+
+
+def invalidate_post_cards(*post_ids):
+    generation = get_post_card_generation()
+    cache.delete_many(
+        [post_card_key(post_id, generation) for post_id in post_ids]
+    )
+
+
+def get_next_publication():
+    next_publication = cache.get(NEXT_PUBLICATION_KEY)
+    if next_publication is False or (
+            next_publication is not None and next_publication > tz.now()):
+        return next_publication
+    if next_publication is not None:
+        bump_generation(PAGE_GENERATION_KEY)
+    next_publication = find_next_publication() or False
+    cache.set(NEXT_PUBLICATION_KEY, next_publication, None)
+    return next_publication
+
+
+def find_next_publication():
+    return (
+        Post.objects.scheduled()
+        .values_list('pub_date', flat=True)
+        .first()
+    )
+
+
+def get_page_generation():
+    get_next_publication()
+    return get_generation(PAGE_GENERATION_KEY)
+
+
+def purge_pages():
+    bump_generation(PAGE_GENERATION_KEY)
+    cache.delete(NEXT_PUBLICATION_KEY)
+
+
+def page_key(path, params):
+    digest = hashlib.md5(repr((path, params)).encode()).hexdigest()
+    return f'blog:page:{get_page_generation()}:{digest}'
+
+
+def get_page_timeout(timeout):
+    next_publication = get_next_publication()
+    if next_publication:
+        timeout = min(
+            timeout, int((next_publication - tz.now()).total_seconds())
+        )
+    return timeout
@@ -0,0 +1,86 @@
+import csv
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from .models import Comment, Post
+from constants import EXPORT_CHUNK_SIZE
+
+EXPORTS = {
+    'post': (
+        Post.objects.order_by('pk'),
+        (
+            'id',
+            'title',
+            'text',
+            'pub_date',
+            'author__username',
+            'category__slug',
+            'location__name',
+            'is_published',
+            'comment_count',
+            'created_at',
+        ),
+    ),
+    'comment': (
+        Comment.objects.order_by('pk'),
+        (
+            'id',
+            'post_id',
+            'author__username',
+            'text',
+            'is_published',
+            'created_at',
+        ),
+    ),
+}
+PUB_DATE_LOOKUPS = {
+    'post': 'pub_date',
+    'comment': 'post__pub_date',
+}
+
+
+class Echo:
+    def write(self, value):
+        return value
+
+
+def get_export(model, since=None, until=None, queryset=None):
+    default_queryset, fields = EXPORTS[model]
+    if queryset is None:
+        queryset = default_queryset
+    lookup = PUB_DATE_LOOKUPS[model]
+    if since is not None:
+        queryset = queryset.filter(**{f'{lookup}__gte': since})
+    if until is not None:
+        queryset = queryset.filter(**{f'{lookup}__lt': until})
+    return queryset.order_by('pk').values_list(*fields), fields
+
+
+def iter_rows(queryset, chunk_size=EXPORT_CHUNK_SIZE):
+    return queryset.iterator(chunk_size=chunk_size)
+
+
+def iter_jsonl(rows, fields):
+    encoder = DjangoJSONEncoder(ensure_ascii=False)
+    for row in rows:
+        yield encoder.encode(dict(zip(fields, row))) + '\n'
+
+
+def iter_csv(rows, fields):
+    writer = csv.writer(Echo())
+    yield writer.writerow(fields)
+    for row in rows:
+        yield writer.writerow(row)
+
+
+FORMATS = {
+    'jsonl': (iter_jsonl, 'application/x-ndjson'),
+    'csv': (iter_csv, 'text/csv'),
+}
+
+
+def export_lines(model, export_format, chunk_size=EXPORT_CHUNK_SIZE,
+                 **filters):
+    queryset, fields = get_export(model, **filters)
+    serialize, _ = FORMATS[export_format]
+    return serialize(iter_rows(queryset, chunk_size), fields)
@@ -1,6 +1,10 @@
 from django import forms
+from django.contrib.auth.forms import PasswordResetForm
+from django.template import loader
 
 from .models import Post, Comment, User
+from .tasks import send_email
+from core.tasks import enqueue
 
 
 class PostForm(forms.ModelForm):
@@ -29,3 +33,20 @@ class CommentForm(forms.ModelForm):
     class Meta:
         model = Comment
         fields = ('text', )
+
+
+class QueuedPasswordResetForm(PasswordResetForm):
+    def send_mail(self, subject_template_name, email_template_name,
+                  context, from_email, to_email,
+                  html_email_template_name=None):
+        subject = ''.join(
+            loader.render_to_string(subject_template_name, context)
+            .splitlines()
+        )
+        body = loader.render_to_string(email_template_name, context)
+        html_body = None
+        if html_email_template_name is not None:
+            html_body = loader.render_to_string(
+                html_email_template_name, context
+            )
+        enqueue(send_email, subject, body, from_email, [to_email], html_body)
@@ -0,0 +1,62 @@
+import os
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from PIL import Image
+
+from constants import (
+    POST_IMAGE_FORMATS, POST_IMAGE_QUALITY, POST_IMAGE_VARIANTS
+)
+
+
+def variant_name(name, variant, extension):
+    directory, filename = os.path.split(name)
+    return os.path.join(
+        directory, 'variants', f'{filename}_{variant}.{extension}'
+    )
+
+
+def flatten(image):
+    if image.mode != 'RGBA':
+        return image
+    background = Image.new('RGB', image.size, 'white')
+    background.paste(image, mask=image.getchannel('A'))
+    return background
+
+
+def make_variants(name, storage):
+    with storage.open(name) as original:
+        source = Image.open(original)
+        source.load()
+    variants = {}
+    for variant, size in POST_IMAGE_VARIANTS.items():
+        image = source.copy()
+        image.thumbnail(size, Image.LANCZOS)
+        if image.mode not in ('RGB', 'RGBA'):
+            image = image.convert('RGBA')
+        for extension, image_format in POST_IMAGE_FORMATS.items():
+            buffer = BytesIO()
+            prepared = image if image_format == 'WEBP' else flatten(image)
+            prepared.save(
+                buffer, image_format, quality=POST_IMAGE_QUALITY,
+                optimize=True
+            )
+            target = variant_name(name, variant, extension)
+            if storage.exists(target):
+                storage.delete(target)
+            variants[f'{variant}.{extension}'] = storage.save(
+                target, ContentFile(buffer.getvalue())
+            )
+    return variants
+
+
+def delete_variants(names, storage):
+    for name in names:
+        storage.delete(name)
+
+
+def get_variant_url(image, variants, variant, extension='jpg'):
+    name = variants.get(f'{variant}.{extension}')
+    if name is None:
+        return image.url
+    return image.storage.url(name)
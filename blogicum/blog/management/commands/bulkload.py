@@ -0,0 +1,243 @@
+import gzip
+import json
+import re
+import time
+from collections import Counter, defaultdict
+
+from django.core import serializers
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.core.serializers.base import DeserializationError
+from django.db import (
+    DEFAULT_DB_ALIAS, IntegrityError, connections, transaction
+)
+
+from blog.cache import bump_post_card_generation, purge_pages
+from blog.models import Category, Comment, Post
+from blog.search import rebuild_index
+
+CHUNK_SIZE = 64 * 1024
+MAX_RECORD_SIZE = 16 * 1024 * 1024
+SEPARATORS = re.compile(r'[ \t\r\n,\[\]]*')
+DEFAULT_EXCLUDED = ('admin', 'auth.permission', 'contenttypes', 'sessions')
+
+
+def open_fixture(path):
+    if path.endswith('.gz'):
+        return gzip.open(path, 'rt', encoding='utf-8')
+    return open(path, encoding='utf-8')
+
+
+def iter_records(stream, max_size=MAX_RECORD_SIZE):
+    decoder = json.JSONDecoder()
+    buffer = ''
+    position = offset = 0
+    line = 1
+    eof = False
+
+    def location(index):
+        lines = buffer.count('\n', 0, index)
+        return f'строка {line + lines}, смещение {offset + index}'
+
+    while True:
+        position = SEPARATORS.match(buffer, position).end()
+        try:
+            record, end = decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError as error:
+            if eof:
+                if position == len(buffer):
+                    return
+                raise CommandError(
+                    f'Некорректный JSON ({location(error.pos)}): {error.msg}'
+                )
+            if len(buffer) - position > max_size:
+                raise CommandError(
+                    f'Запись ({location(position)}) длиннее '
+                    f'{max_size} символов.'
+                )
+            line += buffer.count('\n', 0, position)
+            offset += position
+            chunk = stream.read(CHUNK_SIZE)
+            eof = not chunk
+            buffer = buffer[position:] + chunk
+            position = 0
+            continue
+        position = end
+        yield record
+
+
+def dependency_order(models):
+    ordered = []
+
+    def visit(model, seen):
+        if model in ordered or model in seen:
+            return
+        for field in model._meta.concrete_fields:
+            if field.is_relation and field.related_model in models:
+                visit(field.related_model, seen | {model})
+        ordered.append(model)
+
+    for model in models:
+        visit(model, frozenset())
+    return ordered
+
+
+class Command(BaseCommand):
+    help = ('Быстро загружает фикстуры в формате JSON или JSONL, '
+            'вставляя записи пачками.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('fixtures', nargs='+', help='Пути к фикстурам.')
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Количество записей одной модели в пачке.'
+        )
+        parser.add_argument(
+            '--database',
+            default=DEFAULT_DB_ALIAS,
+            help='База данных для загрузки.'
+        )
+        parser.add_argument(
+            '-e', '--exclude',
+            action='append',
+            default=[],
+            help=(
+                'Не загружать приложение или модель (app_label[.Model]). '
+                'Записи admin, auth.permission, contenttypes и sessions '
+                'пропускаются всегда.'
+            )
+        )
+        parser.add_argument(
+            '--ignore-conflicts',
+            action='store_true',
+            help='Пропускать записи, которые уже есть в базе.'
+        )
+
+    def handle(self, *args, **options):
+        self.using = options['database']
+        self.batch_size = options['batch_size']
+        self.ignore_conflicts = options['ignore_conflicts']
+        self.excluded = {
+            label.lower()
+            for label in (*DEFAULT_EXCLUDED, *options['exclude'])
+        }
+        self.buffers = defaultdict(list)
+        self.loaded = Counter()
+        started = time.monotonic()
+        connection = connections[self.using]
+        try:
+            with transaction.atomic(using=self.using):
+                with connection.constraint_checks_disabled():
+                    for path in options['fixtures']:
+                        with open_fixture(path) as stream:
+                            self.load(stream)
+                    for model in dependency_order(list(self.buffers)):
+                        self.flush(model)
+                models = list(self.loaded)
+                connection.check_constraints(
+                    table_names=[model._meta.db_table for model in models]
+                )
+                self.reset_sequences(connection, models)
+        except IntegrityError as error:
+            raise CommandError(
+                f'Ошибка целостности данных: {error}. Исключите уже '
+                'загруженные модели через -e или пропустите существующие '
+                'записи с --ignore-conflicts.'
+            )
+        self.refresh_blog(models)
+        self.report(time.monotonic() - started)
+
+    def load(self, stream):
+        for record in iter_records(stream):
+            label = record.get('model', '').lower()
+            if label in self.excluded or label.split('.')[0] in self.excluded:
+                continue
+            try:
+                deserialized, = serializers.deserialize(
+                    'python', [record], using=self.using
+                )
+            except (DeserializationError, LookupError) as error:
+                raise CommandError(f'Ошибка в записи {label}: {error}')
+            model = type(deserialized.object)
+            buffer = self.buffers[model]
+            buffer.append(deserialized)
+            if len(buffer) >= self.batch_size:
+                self.flush(model)
+
+    def flush(self, model):
+        batch = self.buffers[model]
+        if not batch:
+            return
+        self.buffers[model] = []
+        objs = [item.object for item in batch]
+        self.insert(model, objs)
+        for field_name in batch[0].m2m_data:
+            field = model._meta.get_field(field_name)
+            through = field.remote_field.through
+            source = field.m2m_field_name()
+            target = field.m2m_reverse_field_name()
+            self.insert(through, [
+                through(**{f'{source}_id': item.object.pk,
+                           f'{target}_id': related_pk})
+                for item in batch
+                for related_pk in item.m2m_data[field_name]
+            ])
+
+    def insert(self, model, objs):
+        with_pk = [obj for obj in objs if obj.pk is not None]
+        without_pk = [obj for obj in objs if obj.pk is None]
+        for group, has_pk in ((with_pk, True), (without_pk, False)):
+            if group:
+                self.insert_group(model, group, has_pk)
+
+    def insert_group(self, model, objs, has_pk):
+        fields = [
+            field for field in model._meta.local_concrete_fields
+            if has_pk or not field.primary_key
+        ]
+        size = max(1, min(
+            self.batch_size,
+            connections[self.using].ops.bulk_batch_size(fields, objs)
+        ))
+        manager = model._base_manager
+        for start in range(0, len(objs), size):
+            manager._insert(
+                objs[start:start + size],
+                fields=fields,
+                raw=True,
+                using=self.using,
+                ignore_conflicts=self.ignore_conflicts
+            )
+        self.loaded[model] += len(objs)
+
+    def reset_sequences(self, connection, models):
+        statements = connection.ops.sequence_reset_sql(no_style(), models)
+        with connection.cursor() as cursor:
+            for sql in statements:
+                cursor.execute(sql)
+
+    def refresh_blog(self, models):
+        if Post in models or Category in models:
+            Post.objects.using(self.using).refresh_visibility()
+        if Post in models:
+            rebuild_index(self.using)
+        if Post in models or Comment in models:
+            call_command(
+                'recount_comments', database=self.using, stdout=self.stdout
+            )
+        if any(model._meta.app_label == 'blog' for model in models):
+            bump_post_card_generation()
+            purge_pages()
+
+    def report(self, elapsed):
+        total = sum(self.loaded.values())
+        for model, count in self.loaded.items():
+            self.stdout.write(f'{model._meta.label}: {count}')
+        rate = total / elapsed if elapsed else total
+        self.stdout.write(self.style.SUCCESS(
+            f'Загружено записей: {total} за {elapsed:.2f} с '
+            f'({rate:.0f} записей/с)'
+        ))
@@ -0,0 +1,85 @@
+import gzip
+import sys
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone as tz
+
+from blog.exports import EXPORTS, FORMATS, export_lines
+from constants import EXPORT_CHUNK_SIZE
+
+
+def aware_date(value):
+    try:
+        date = datetime.fromisoformat(value)
+    except ValueError:
+        raise CommandError(f'Некорректная дата: {value}')
+    if tz.is_naive(date):
+        date = tz.make_aware(date)
+    return date
+
+
+class Command(BaseCommand):
+    help = 'Выгружает публикации или комментарии в JSONL или CSV.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('model', choices=EXPORTS)
+        parser.add_argument(
+            '--format',
+            choices=FORMATS,
+            default='jsonl',
+            help='Формат выгрузки.'
+        )
+        parser.add_argument(
+            '-o', '--output',
+            help='Файл для выгрузки, по умолчанию стандартный вывод.'
+        )
+        parser.add_argument(
+            '--gzip',
+            action='store_true',
+            help='Сжать выгрузку gzip.'
+        )
+        parser.add_argument(
+            '--since',
+            type=aware_date,
+            help='Начало диапазона дат публикации (ISO 8601).'
+        )
+        parser.add_argument(
+            '--until',
+            type=aware_date,
+            help='Конец диапазона дат публикации, не включая его.'
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=EXPORT_CHUNK_SIZE,
+            help='Количество строк, читаемых из базы за один раз.'
+        )
+
+    def handle(self, *args, **options):
+        lines = export_lines(
+            options['model'],
+            options['format'],
+            chunk_size=options['chunk_size'],
+            since=options['since'],
+            until=options['until'],
+        )
+        stream = self.open(options['output'], options['gzip'])
+        total = 0
+        try:
+            for line in lines:
+                stream.write(line)
+                total += 1
+        finally:
+            if stream is not self.stdout:
+                stream.close()
+        self.stderr.write(f'Записано строк: {total}')
+
+    def open(self, output, compress):
+        if compress:
+            if output is None:
+                return gzip.open(sys.stdout.buffer, 'wt', encoding='utf-8')
+            return gzip.open(output, 'wt', encoding='utf-8', newline='')
+        if output is None:
+            return self.stdout
+        return open(output, 'w', encoding='utf-8', newline='')
@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models import F
+
+from blog.managers import published_comment_count
+from blog.models import Post
+
+
+class Command(BaseCommand):
+    help = ('Пересчитывает сохранённое количество комментариев '
+            'у публикаций и исправляет расхождения.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Только показать расхождения, ничего не исправляя.'
+        )
+        parser.add_argument(
+            '--database',
+            default=DEFAULT_DB_ALIAS,
+            help='База данных для пересчёта.'
+        )
+
+    def handle(self, *args, **options):
+        posts = Post.objects.using(options['database'])
+        drifted = (
+            posts
+            .annotate(actual=published_comment_count(Post))
+            .exclude(comment_count=F('actual'))
+        )
+        total = drifted.count()
+        if options['check'] or not total:
+            self.stdout.write(f'Публикаций с расхождениями: {total}')
+            return
+        updated = (
+            posts
+            .filter(pk__in=drifted.values('pk'))
+            .recount_comments()
+        )
+        self.stdout.write(
+            self.style.SUCCESS(f'Исправлено публикаций: {updated}')
+        )
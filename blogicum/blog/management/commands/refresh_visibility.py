@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from blog.cache import purge_pages
+from blog.models import Post
+
+
+class Command(BaseCommand):
+    help = ('Сверяет сохранённый флаг видимости публикаций с их '
+            'категориями и исправляет расхождения. Отложенные публикации '
+            'появляются в ленте в своё время и без этой команды.')
+
+    def handle(self, *args, **options):
+        changed = Post.objects.refresh_visibility()
+        if changed:
+            purge_pages()
+        self.stdout.write(f'Изменена видимость публикаций: {changed}')
@@ -1,18 +1,78 @@
 from django.db import models
-from django.db.models import Count
+from django.db.models import (
+    BooleanField, Case, Count, Exists, F, OuterRef, Q, Subquery, Value, When
+)
+from django.db.models.functions import Coalesce
 from django.utils import timezone as tz
 
 
+VISIBLE = Q(is_published=True, category__is_published=True)
+
+
+def published_comment_count(post_model):
+    comment = post_model._meta.get_field('comment').related_model
+    return Coalesce(
+        Subquery(
+            comment.objects
+            .filter(post=OuterRef('pk'), is_published=True)
+            .order_by()
+            .values('post')
+            .annotate(total=Count('pk'))
+            .values('total')
+        ),
+        0
+    )
+
+
 class PostQuerySet(models.QuerySet):
     def published(self):
-        return self.filter(
+        return self.filter(is_visible=True, pub_date__lte=tz.now())
+
+    def scheduled(self):
+        return (
+            self.filter(is_visible=True, pub_date__gt=tz.now())
+            .order_by('pub_date')
+        )
+
+    def refresh_visibility(self):
+        shown = (
+            self.filter(VISIBLE, is_visible=False)
+            .update(is_visible=True)
+        )
+        hidden = (
+            self.filter(is_visible=True)
+            .exclude(VISIBLE)
+            .update(is_visible=False)
+        )
+        return shown + hidden
+
+    def set_published(self, is_published):
+        if not is_published:
+            return self.update(is_published=False, is_visible=False)
+        category = self.model._meta.get_field('category').related_model
+        return self.update(
             is_published=True,
-            pub_date__lt=tz.now(),
-            category__is_published=True
+            is_visible=Case(
+                When(
+                    Exists(
+                        category.objects
+                        .filter(pk=OuterRef('category_id'), is_published=True)
+                    ),
+                    then=Value(True)
+                ),
+                default=Value(False),
+                output_field=BooleanField()
+            )
         )
 
-    def count_comment(self):
-        return self.annotate(comment_count=Count('comment'))
+    def shift_comment_count(self, delta):
+        queryset = self
+        if delta < 0:
+            queryset = queryset.filter(comment_count__gte=-delta)
+        return queryset.update(comment_count=F('comment_count') + delta)
+
+    def recount_comments(self):
+        return self.update(comment_count=published_comment_count(self.model))
 
     def related_table(self):
         return self.select_related('author', 'location', 'category')
@@ -22,8 +82,8 @@ class PostManager(models.Manager):
     def get_queryset(self):
         return (
             PostQuerySet(self.model)
+            .related_table()
             .published()
-            .count_comment()
             .order_by('-pub_date')
         )
 
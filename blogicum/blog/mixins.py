@@ -1,11 +1,101 @@
+import hashlib
+from copy import copy
+from functools import partial
+
+from django.conf import settings
 from django.core.exceptions import PermissionDenied
+from django.core.cache import cache
+from django.core.files.storage import default_storage
 from django.core.paginator import EmptyPage, Paginator
-from django.shortcuts import get_object_or_404, redirect
+from django.db import transaction
+from django.db.models import FileField
+from django.http import HttpResponse, HttpResponseRedirect, JsonResponse
+from django.utils.cache import (
+    get_conditional_response, patch_vary_headers
+)
+from django.utils.http import quote_etag
+from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse
 
+from .cache import get_page_generation, get_page_timeout, page_key
 from .forms import CommentForm
+from .images import delete_variants
+from .tasks import make_post_image_variants
 from .models import Comment, Post
-from constants import POST_PER_PAGE
+from .paginators import CursorPaginator
+from core.metrics import registry
+from core.middleware import SAFE_METHODS
+from core.routers import replica_reads
+from core.sqlite import run_serialized
+from core.tasks import enqueue
+from constants import (
+    COMMENT_PER_PAGE, CURSOR_PAGE_KWARG, PAGE_CACHE_TIMEOUT, POST_PER_PAGE,
+    REPLICA_STICKY_COOKIE, REPLICA_STICKY_SECONDS
+)
+
+
+class SerializedWriteMixin:
+    def store_files(self, instance):
+        stored = []
+        for field in instance._meta.concrete_fields:
+            if not isinstance(field, FileField):
+                continue
+            file = getattr(instance, field.attname)
+            if file and not file._committed:
+                stored.append(field.pre_save(instance, add=False))
+        return stored
+
+    def run_serialized(self, instance, func):
+        state = instance.__getstate__()
+
+        def attempt():
+            instance.__dict__.clear()
+            instance.__dict__.update(state)
+            instance._state = copy(state['_state'])
+            instance._state.fields_cache = dict(state['_state'].fields_cache)
+            return func()
+
+        return run_serialized(attempt)
+
+    def form_valid(self, form):
+        stored = self.store_files(form.instance)
+        try:
+            self.object = self.run_serialized(form.instance, form.save)
+        except Exception:
+            for file in stored:
+                file.delete(save=False)
+            raise
+        return HttpResponseRedirect(self.get_success_url())
+
+    def delete(self, request, *args, **kwargs):
+        self.object = self.get_object()
+        success_url = self.get_success_url()
+        self.run_serialized(self.object, self.object.delete)
+        return HttpResponseRedirect(success_url)
+
+
+class ReplicaReadMixin:
+    def dispatch(self, request, *args, **kwargs):
+        replica_reads.set(
+            bool(settings.DATABASE_REPLICAS)
+            and request.method in SAFE_METHODS
+            and REPLICA_STICKY_COOKIE not in request.COOKIES
+        )
+        return super().dispatch(request, *args, **kwargs)
+
+
+class StickyPrimaryMixin:
+    def dispatch(self, request, *args, **kwargs):
+        response = super().dispatch(request, *args, **kwargs)
+        if settings.DATABASE_REPLICAS and request.method not in SAFE_METHODS:
+            response.set_cookie(
+                REPLICA_STICKY_COOKIE,
+                '1',
+                max_age=REPLICA_STICKY_SECONDS,
+                httponly=True,
+                samesite='Lax'
+            )
+        return response
 
 
 class ProfileUrlMixin:
@@ -25,51 +115,112 @@ class CommentMixin:
         return reverse('blog:post_detail', kwargs={'pk': self.kwargs['pk']})
 
 
-class CommentObjectMixin:
-    def get_object(self):
-        queryset = self.queryset.filter(pk=self.kwargs['id'])
-        return super().get_object(queryset=queryset)
+class CommentPageMixin:
+    def get_comment_page(self, cursor=None):
+        return CursorPaginator(
+            Comment.published.filter(post_id=self.kwargs['pk']),
+            COMMENT_PER_PAGE,
+            field='created_at',
+            descending=False
+        ).get_page(cursor)
 
 
-class CommentDataMixin:
+class CommentDataMixin(CommentPageMixin):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['comments'] = (
-            Comment.published
-            .filter(post__id=self.kwargs['pk'])
-        )
+        context['comments'] = self.get_comment_page()
         context['form'] = CommentForm()
         return context
 
 
-class PostDispatchMixin:
+class DispatchedObjectMixin:
+    def get_object(self, queryset=None):
+        return self.object
+
+
+class PostDispatchMixin(DispatchedObjectMixin):
     def dispatch(self, request, *args, **kwargs):
-        instance = get_object_or_404(
-            (Post.objects
-             .related_table()
-             .count_comment()),
+        self.object = get_object_or_404(
+            Post.objects.related_table(),
             pk=kwargs['pk']
         )
-        if instance.author != request.user:
+        if self.object.author != request.user:
             return redirect('blog:post_detail', self.kwargs['pk'])
         return super().dispatch(request, *args, **kwargs)
 
 
-class CommentDispatchMixin:
-    pk_url_kwarg = 'id'
+class PostImageMixin:
+    def form_valid(self, form):
+        if 'image' not in form.changed_data:
+            return super().form_valid(form)
+        stale = list(form.instance.image_variants.values())
+        form.instance.image_variants = {}
+        response = super().form_valid(form)
+        if stale:
+            transaction.on_commit(
+                partial(delete_variants, stale, default_storage)
+            )
+        if self.object.image:
+            transaction.on_commit(partial(
+                enqueue,
+                make_post_image_variants,
+                self.object.pk,
+                self.object.image.name
+            ))
+        return response
 
+
+class CommentDispatchMixin(DispatchedObjectMixin):
     def dispatch(self, request, *args, **kwargs):
-        instance = get_object_or_404(
+        self.object = get_object_or_404(
             Comment.published,
-            pk=kwargs['id']
+            pk=kwargs['id'],
+            post_id=kwargs['pk']
         )
-        if instance.author != request.user:
+        if self.object.author_id != request.user.pk:
             raise PermissionDenied
         return super().dispatch(request, *args, **kwargs)
 
 
+class CommentFragmentMixin:
+    fragment_template_name = 'includes/comment_list.html'
+    fragment_status = 200
+
+    def is_fragment_request(self):
+        return (
+            self.request.headers.get('x-requested-with') == 'XMLHttpRequest'
+            or self.request.GET.get('format') == 'fragment'
+        )
+
+    def form_valid(self, form):
+        response = super().form_valid(form)
+        if not self.is_fragment_request():
+            return response
+        return render(
+            self.request,
+            self.fragment_template_name,
+            {'comments': (self.object,)},
+            status=self.fragment_status
+        )
+
+    def form_invalid(self, form):
+        if not self.is_fragment_request():
+            return super().form_invalid(form)
+        return JsonResponse({'errors': form.errors}, status=400)
+
+
 class PaginatorMixin:
+    def use_cursor_pagination(self):
+        return (settings.BLOG_CURSOR_PAGINATION
+                or CURSOR_PAGE_KWARG in self.request.GET)
+
     def setup_pagination(self, context, per_page=POST_PER_PAGE):
+        if self.use_cursor_pagination():
+            paginator = CursorPaginator(context['post_list'], per_page)
+            context['page_obj'] = paginator.get_page(
+                self.request.GET.get(CURSOR_PAGE_KWARG)
+            )
+            return context
         paginator = Paginator(context['post_list'], per_page)
         page_number = self.request.GET.get('page')
         try:
@@ -77,4 +228,85 @@ class PaginatorMixin:
         except EmptyPage:
             page_obj = paginator.get_page(1)
         context['page_obj'] = page_obj
+        context['page_range'] = paginator.get_elided_page_range(
+            page_obj.number
+        )
         return context
+
+
+class AnonymousPageCacheMixin:
+    cache_query_params = ('page', CURSOR_PAGE_KWARG)
+    page_cache_timeout = PAGE_CACHE_TIMEOUT
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method != 'GET' or request.user.is_authenticated:
+            return super().dispatch(request, *args, **kwargs)
+        replica_reads.set(False)
+        key = page_key(
+            request.path,
+            [request.GET.get(param) for param in self.cache_query_params]
+        )
+        cached = cache.get(key)
+        registry.inc(
+            'blog_cache_requests_total',
+            cache='page',
+            result='miss' if cached is None else 'hit'
+        )
+        if cached is not None:
+            content, status, headers = cached
+            return HttpResponse(content, status=status, headers=headers)
+        response = super().dispatch(request, *args, **kwargs)
+        if response.status_code != 200:
+            return response
+        if hasattr(response, 'add_post_render_callback'):
+            response.add_post_render_callback(
+                lambda response: self.cache_page(key, response)
+            )
+            return response
+        self.cache_page(key, response)
+        return response
+
+    def cache_page(self, key, response):
+        timeout = get_page_timeout(self.page_cache_timeout)
+        if timeout > 0:
+            cache.set(
+                key,
+                (response.content, response.status_code,
+                 dict(response.items())),
+                timeout
+            )
+
+
+class ConditionalGetMixin:
+    def get_etag(self, generation):
+        identity = (
+            self.request.user.pk,
+            self.request.META.get('CSRF_COOKIE', ''),
+            self.request.get_full_path(),
+            generation,
+        )
+        return quote_etag(hashlib.md5(repr(identity).encode()).hexdigest())
+
+    def set_validators(self, response, generation):
+        response['ETag'] = self.get_etag(generation)
+        patch_vary_headers(response, ('Cookie',))
+        return response
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD'):
+            return super().dispatch(request, *args, **kwargs)
+        generation = get_page_generation()
+        response = get_conditional_response(
+            request, etag=self.get_etag(generation)
+        )
+        if response is not None:
+            return self.set_validators(response, generation)
+        response = super().dispatch(request, *args, **kwargs)
+        if response.status_code != 200 or replica_reads.get():
+            return response
+        if hasattr(response, 'add_post_render_callback'):
+            response.add_post_render_callback(
+                lambda response: self.set_validators(response, generation)
+            )
+            return response
+        return self.set_validators(response, generation)
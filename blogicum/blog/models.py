@@ -1,5 +1,9 @@
+from contextvars import ContextVar
+
 from django.contrib.auth import get_user_model
 from django.db import models
+from django.db.models import Q
+from django.utils import timezone as tz
 
 from .managers import CommentManager, PostManager, PostQuerySet
 from constants import PUB_DATE_HELP_TXT, SLUG_HELP_TXT
@@ -7,6 +11,8 @@ from core.models import PublishedModel
 
 User = get_user_model()
 
+deleting_post_id = ContextVar('deleting_post_id', default=None)
+
 
 class Category(PublishedModel):
     title = models.CharField(
@@ -46,6 +52,11 @@ class Post(PublishedModel):
         blank=True,
         upload_to='post'
     )
+    image_variants = models.JSONField(
+        default=dict,
+        editable=False,
+        verbose_name='Уменьшенные копии фото'
+    )
     text = models.TextField(verbose_name='Текст')
     pub_date = models.DateTimeField(
         verbose_name='Дата и время публикации',
@@ -65,15 +76,66 @@ class Post(PublishedModel):
         on_delete=models.SET_NULL,
         verbose_name='Категория'
     )
+    comment_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Количество комментариев'
+    )
+    is_visible = models.BooleanField(
+        default=False,
+        editable=False,
+        verbose_name='Показывается в ленте'
+    )
 
     objects = PostQuerySet().as_manager()
     published = PostManager()
 
     class Meta:
         ordering = ('-pub_date',)
+        indexes = (
+            models.Index(
+                fields=('-pub_date', '-id'),
+                condition=Q(is_visible=True),
+                name='post_published_feed_idx'
+            ),
+            models.Index(
+                fields=('category', '-pub_date', '-id'),
+                condition=Q(is_visible=True),
+                name='post_category_feed_idx'
+            ),
+            models.Index(
+                fields=('author', '-pub_date', '-id'),
+                name='post_author_feed_idx'
+            ),
+        )
         verbose_name = 'публикация'
         verbose_name_plural = 'Публикации'
 
+    def save(self, *args, **kwargs):
+        self.is_visible = self.compute_visibility()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = {*update_fields, 'is_visible'}
+        super().save(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        token = deleting_post_id.set(self.pk)
+        try:
+            return super().delete(*args, **kwargs)
+        finally:
+            deleting_post_id.reset(token)
+
+    def compute_visibility(self):
+        return bool(
+            self.is_published
+            and self.category_id is not None
+            and self.category.is_published
+        )
+
+    def is_visible_to(self, user):
+        return (self.is_published and self.pub_date <= tz.now()
+                or self.author_id == user.pk)
+
 
 class Comment(PublishedModel):
     text = models.TextField(
@@ -94,8 +156,24 @@ class Comment(PublishedModel):
 
     class Meta:
         ordering = ('created_at',)
+        indexes = (
+            models.Index(
+                fields=('post', 'created_at', 'id'),
+                condition=Q(is_published=True),
+                name='comment_post_feed_idx'
+            ),
+        )
         verbose_name = 'комментарий'
         verbose_name_plural = 'Комментарий'
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance.counted_post_id = instance.get_counted_post_id()
+        return instance
+
+    def get_counted_post_id(self):
+        return self.post_id if self.is_published else None
+
     def __str__(self):
         return f'Комментарий {self.author} к посту "{self.post}".'
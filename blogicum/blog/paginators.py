@@ -0,0 +1,132 @@
+from collections.abc import Sequence
+from datetime import datetime
+
+from django.core import signing
+from django.core.paginator import Paginator
+from django.db import DatabaseError, connections
+from django.db.models import Q
+from django.utils.functional import cached_property
+
+from constants import CURSOR_SALT, ESTIMATED_COUNT_THRESHOLD
+
+NEXT = 'n'
+PREVIOUS = 'p'
+
+
+class CursorPage(Sequence):
+    is_cursor = True
+
+    def __init__(self, object_list, next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __repr__(self):
+        return f'<CursorPage of {len(self)} items>'
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class CursorPaginator:
+    def __init__(self, queryset, per_page, field='pub_date', descending=True):
+        self.queryset = queryset
+        self.per_page = per_page
+        self.field = field
+        self.descending = descending
+
+    def encode(self, obj, direction):
+        return signing.dumps(
+            (getattr(obj, self.field).isoformat(), obj.pk, direction),
+            salt=CURSOR_SALT
+        )
+
+    def decode(self, token):
+        try:
+            value, pk, direction = signing.loads(token, salt=CURSOR_SALT)
+            return datetime.fromisoformat(value), int(pk), direction
+        except (signing.BadSignature, TypeError, ValueError):
+            return None
+
+    def _fetch(self, value=None, pk=None, backwards=False):
+        descending = self.descending != backwards
+        prefix, lookup = ('-', 'lt') if descending else ('', 'gt')
+        queryset = self.queryset
+        if value is not None:
+            queryset = queryset.filter(
+                Q(**{f'{self.field}__{lookup}': value})
+                | Q(**{self.field: value, f'pk__{lookup}': pk})
+            )
+        rows = list(
+            queryset.order_by(f'{prefix}{self.field}', f'{prefix}pk')
+            [:self.per_page + 1]
+        )
+        return rows[:self.per_page], len(rows) > self.per_page
+
+    def get_page(self, token=None):
+        cursor = self.decode(token) if token else None
+        if cursor is None:
+            rows, has_more = self._fetch()
+            return CursorPage(
+                rows,
+                next_cursor=self.encode(rows[-1], NEXT) if has_more else None
+            )
+        value, pk, direction = cursor
+        if direction == PREVIOUS:
+            rows, has_more = self._fetch(value, pk, backwards=True)
+            rows.reverse()
+            return CursorPage(
+                rows,
+                next_cursor=self.encode(rows[-1], NEXT) if rows else None,
+                previous_cursor=(
+                    self.encode(rows[0], PREVIOUS) if has_more else None
+                )
+            )
+        rows, has_more = self._fetch(value, pk)
+        return CursorPage(
+            rows,
+            next_cursor=self.encode(rows[-1], NEXT) if has_more else None,
+            previous_cursor=self.encode(rows[0], PREVIOUS) if rows else None
+        )
+
+
+def estimate_count(model, using):
+    connection = connections[using]
+    table = model._meta.db_table
+    if connection.vendor == 'postgresql':
+        sql = 'SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass'
+    elif connection.vendor == 'sqlite':
+        sql = ("SELECT max(CAST(stat AS INTEGER)) FROM sqlite_stat1 "
+               "WHERE tbl = %s")
+    else:
+        return None
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(sql, (table,))
+            row = cursor.fetchone()
+    except DatabaseError:
+        return None
+    return row[0] if row and row[0] and row[0] > 0 else None
+
+
+class EstimatedCountPaginator(Paginator):
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if not queryset.query.where:
+            estimate = estimate_count(queryset.model, queryset.db)
+            if estimate is not None and estimate >= ESTIMATED_COUNT_THRESHOLD:
+                return estimate
+        return super().count
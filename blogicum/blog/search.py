@@ -0,0 +1,76 @@
+import re
+
+from django.db import connections
+from django.db.models import BooleanField, Q
+from django.db.models.expressions import RawSQL
+
+FTS_TABLE = 'blog_post_fts'
+PG_SEARCH_CONFIG = 'russian'
+PG_DOCUMENT = (
+    f"to_tsvector('{PG_SEARCH_CONFIG}', "
+    "coalesce(blog_post.title, '') || ' ' || coalesce(blog_post.text, ''))"
+)
+
+
+def fts_query(query):
+    return ' '.join(f'"{word}"*' for word in re.findall(r'\w+', query))
+
+
+def naive_search(queryset, query):
+    return queryset.filter(
+        Q(title__icontains=query) | Q(text__icontains=query)
+    )
+
+
+def search_posts(queryset, query):
+    vendor = connections[queryset.db].vendor
+    if vendor == 'sqlite':
+        match = fts_query(query)
+        if not match:
+            return queryset.none()
+        return queryset.filter(RawSQL(
+            f'blog_post.id IN (SELECT rowid FROM {FTS_TABLE} '
+            f'WHERE {FTS_TABLE} MATCH %s)',
+            (match,),
+            output_field=BooleanField()
+        ))
+    if vendor == 'postgresql':
+        return queryset.filter(RawSQL(
+            f"{PG_DOCUMENT} @@ plainto_tsquery('{PG_SEARCH_CONFIG}', %s)",
+            (query,),
+            output_field=BooleanField()
+        ))
+    return naive_search(queryset, query)
+
+
+def index_post(post, using):
+    connection = connections[using]
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', (post.pk,))
+        cursor.execute(
+            f'INSERT INTO {FTS_TABLE} (rowid, title, text) '
+            'VALUES (%s, %s, %s)',
+            (post.pk, post.title, post.text)
+        )
+
+
+def unindex_post(post_id, using):
+    connection = connections[using]
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', (post_id,))
+
+
+def rebuild_index(using):
+    connection = connections[using]
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE}')
+        cursor.execute(
+            f'INSERT INTO {FTS_TABLE} (rowid, title, text) '
+            'SELECT id, title, text FROM blog_post'
+        )
@@ -0,0 +1,142 @@
+from functools import partial
+
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .cache import (
+    bump_post_card_generation, invalidate_post_cards, purge_pages
+)
+from .images import delete_variants
+from .models import Category, Comment, Location, Post, User, deleting_post_id
+from .search import index_post, unindex_post
+from core.metrics import registry
+
+
+def now_and_on_commit(func, *args):
+    func(*args)
+    transaction.on_commit(partial(func, *args))
+
+
+@receiver(post_save, sender=Comment)
+def update_comment_count_on_save(sender, instance, raw, using, **kwargs):
+    if raw:
+        (
+            Post.objects.using(using)
+            .filter(pk=instance.post_id)
+            .recount_comments()
+        )
+        return
+    old_post_id = getattr(instance, 'counted_post_id', None)
+    new_post_id = instance.get_counted_post_id()
+    if old_post_id != new_post_id:
+        if old_post_id is not None:
+            Post.objects.filter(pk=old_post_id).shift_comment_count(-1)
+        if new_post_id is not None:
+            Post.objects.filter(pk=new_post_id).shift_comment_count(1)
+        now_and_on_commit(
+            invalidate_post_cards,
+            *{old_post_id, new_post_id}.difference({None})
+        )
+    instance.counted_post_id = new_post_id
+
+
+@receiver(post_delete, sender=Comment)
+def update_comment_count_on_delete(sender, instance, **kwargs):
+    post_id = getattr(
+        instance, 'counted_post_id', instance.get_counted_post_id()
+    )
+    if post_id is not None and post_id != deleting_post_id.get():
+        Post.objects.filter(pk=post_id).shift_comment_count(-1)
+        now_and_on_commit(invalidate_post_cards, post_id)
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def invalidate_post_card(sender, instance, **kwargs):
+    now_and_on_commit(invalidate_post_cards, instance.pk)
+
+
+@receiver(post_save, sender=Post)
+def refresh_loaded_post(sender, instance, raw, using, **kwargs):
+    if raw:
+        posts = Post.objects.using(using).filter(pk=instance.pk)
+        posts.refresh_visibility()
+        posts.recount_comments()
+
+
+@receiver(post_save, sender=Post)
+def update_search_index(sender, instance, using, update_fields, **kwargs):
+    if update_fields is None or {'title', 'text'} & set(update_fields):
+        index_post(instance, using)
+
+
+@receiver(post_delete, sender=Post)
+def remove_from_search_index(sender, instance, using, **kwargs):
+    unindex_post(instance.pk, using)
+
+
+@receiver(post_delete, sender=Post)
+def remove_image_variants(sender, instance, using, **kwargs):
+    if instance.image_variants:
+        transaction.on_commit(
+            partial(
+                delete_variants,
+                list(instance.image_variants.values()),
+                default_storage
+            ),
+            using=using
+        )
+
+
+@receiver(post_save, sender=Category)
+def refresh_category_visibility(sender, instance, using, **kwargs):
+    Post.objects.using(using).filter(category=instance).refresh_visibility()
+
+
+@receiver(post_delete, sender=Category)
+def hide_uncategorized_posts(sender, **kwargs):
+    Post.objects.filter(category=None).refresh_visibility()
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+def invalidate_all_post_cards(sender, **kwargs):
+    now_and_on_commit(bump_post_card_generation)
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+def purge_cached_pages(sender, **kwargs):
+    now_and_on_commit(purge_pages)
+
+
+@receiver(post_save, sender=User)
+def purge_pages_on_profile_change(sender, update_fields, **kwargs):
+    if update_fields is None or set(update_fields) != {'last_login'}:
+        now_and_on_commit(purge_pages)
+
+
+@receiver(post_save, sender=Post)
+def count_created_post(sender, created, raw, **kwargs):
+    if created and not raw:
+        transaction.on_commit(
+            partial(registry.inc, 'blog_posts_created_total')
+        )
+
+
+@receiver(post_save, sender=Comment)
+def count_created_comment(sender, created, raw, **kwargs):
+    if created and not raw:
+        transaction.on_commit(
+            partial(registry.inc, 'blog_comments_created_total')
+        )
@@ -0,0 +1,26 @@
+from django.core.files.storage import default_storage
+from django.core.mail import EmailMultiAlternatives
+
+from .cache import invalidate_post_cards, purge_pages
+from .images import delete_variants, make_variants
+from .models import Post
+from core.tasks import task
+
+
+@task
+def make_post_image_variants(post_id, name):
+    variants = make_variants(name, default_storage)
+    if not Post.objects.filter(pk=post_id, image=name).update(
+            image_variants=variants):
+        delete_variants(variants.values(), default_storage)
+        return
+    invalidate_post_cards(post_id)
+    purge_pages()
+
+
+@task
+def send_email(subject, body, from_email, to, html_body=None):
+    message = EmailMultiAlternatives(subject, body, from_email, to)
+    if html_body is not None:
+        message.attach_alternative(html_body, 'text/html')
+    message.send()
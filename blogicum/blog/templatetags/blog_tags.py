@@ -0,0 +1,41 @@
+from django import template
+from django.core.cache import cache
+from django.utils.safestring import mark_safe
+
+from blog.cache import get_post_card_generation, post_card_key
+from blog.images import get_variant_url
+from constants import POST_CARD_CACHE_TIMEOUT
+from core.metrics import registry
+
+register = template.Library()
+
+
+@register.simple_tag(takes_context=True)
+def post_cards(context, posts):
+    generation = get_post_card_generation()
+    keys = [post_card_key(post.pk, generation) for post in posts]
+    cards = cache.get_many(keys)
+    rendered = {}
+    card_template = context.template.engine.get_template(
+        'includes/post_card.html'
+    )
+    for key, post in zip(keys, posts):
+        if key not in cards:
+            with context.push(post=post):
+                rendered[key] = card_template.render(context)
+    registry.inc(
+        'blog_cache_requests_total', len(cards), cache='card', result='hit'
+    )
+    if rendered:
+        registry.inc(
+            'blog_cache_requests_total', len(rendered),
+            cache='card', result='miss'
+        )
+        cache.set_many(rendered, POST_CARD_CACHE_TIMEOUT)
+        cards.update(rendered)
+    return [mark_safe(cards[key]) for key in keys]
+
+
+@register.simple_tag
+def image_variant(post, variant, extension='jpg'):
+    return get_variant_url(post.image, post.image_variants, variant, extension)
@@ -16,6 +16,7 @@ urlpatterns = [
         views.CategoryListView.as_view(),
         name='category_posts'
     ),
+    path('search/', views.PostSearchView.as_view(), name='search'),
     path(
         'posts/create/',
         views.PostCreateView.as_view(),
@@ -33,7 +34,7 @@ urlpatterns = [
     ),
     path(
         'profile/<slug:username>/',
-        views.ProfileListView.as_view(),
+        views.ProfileDetailView.as_view(),
         name='profile'
     ),
     path(
@@ -41,6 +42,11 @@ urlpatterns = [
         views.ProfileUpdateView.as_view(),
         name='edit_profile'
     ),
+    path(
+        'posts/<int:pk>/comments/',
+        views.CommentListView.as_view(),
+        name='comments'
+    ),
     path(
         'posts/<int:pk>/comment/',
         views.CommentCreateView.as_view(),
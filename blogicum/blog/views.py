@@ -1,43 +1,89 @@
 from django.contrib.auth.forms import UserCreationForm
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.core.exceptions import PermissionDenied
+from django.http import Http404, HttpResponse, JsonResponse
 from django.shortcuts import get_object_or_404
 from django.urls import reverse, reverse_lazy
-from django.utils import timezone as tz
 from django.views.generic import (
-    CreateView, DeleteView, DetailView, ListView, UpdateView
+    CreateView, DeleteView, DetailView, ListView, TemplateView, UpdateView
 )
 
 from .forms import PostForm, ProfileForm
 from .mixins import (
-    CommentDataMixin, CommentDispatchMixin, CommentMixin, CommentObjectMixin,
-    PaginatorMixin, PostDispatchMixin, ProfileUrlMixin
+    AnonymousPageCacheMixin, CommentDataMixin, CommentDispatchMixin,
+    CommentFragmentMixin, CommentMixin, CommentPageMixin, ConditionalGetMixin,
+    PaginatorMixin, PostDispatchMixin, PostImageMixin, ProfileUrlMixin,
+    ReplicaReadMixin, SerializedWriteMixin, StickyPrimaryMixin
 )
 from .models import Category, Post, User
-from constants import POST_PER_PAGE
+from .search import search_posts
+from constants import CURSOR_PAGE_KWARG
 
 
-class IndexListView(ListView):
+class IndexListView(ReplicaReadMixin, ConditionalGetMixin,
+                    AnonymousPageCacheMixin, PaginatorMixin, ListView):
     model = Post
-    queryset = Post.published.all()
-    paginate_by = POST_PER_PAGE
 
+    def get_queryset(self):
+        return Post.published.all()
 
-class PostDetailView(CommentDataMixin, DetailView):
+    def get_context_data(self, **kwargs):
+        return self.setup_pagination(super().get_context_data(**kwargs))
+
+
+class PostDetailView(ReplicaReadMixin, ConditionalGetMixin,
+                     AnonymousPageCacheMixin, CommentDataMixin, DetailView):
     model = Post
 
-    def dispatch(self, request, *args, **kwargs):
-        instance = get_object_or_404(
-            Post.objects.related_table().count_comment(),
-            pk=kwargs['pk']
+    def get_object(self, queryset=None):
+        post = get_object_or_404(
+            Post.objects.related_table(),
+            pk=self.kwargs['pk']
         )
-        if (instance.is_published and instance.pub_date < tz.now()
-                or instance.author == self.request.user):
-            return super().dispatch(request, *args, **kwargs)
+        if post.is_visible_to(self.request.user):
+            return post
         raise PermissionDenied
 
 
-class PostCreateView(LoginRequiredMixin, ProfileUrlMixin, CreateView):
+class CommentListView(ReplicaReadMixin, AnonymousPageCacheMixin,
+                      CommentPageMixin, TemplateView):
+    template_name = 'includes/comment_list.html'
+    cache_query_params = (CURSOR_PAGE_KWARG, 'format')
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        post = get_object_or_404(
+            Post.objects.only('is_published', 'pub_date', 'author'),
+            pk=self.kwargs['pk']
+        )
+        if not post.is_visible_to(self.request.user):
+            raise PermissionDenied
+        context['post'] = post
+        context['comments'] = self.get_comment_page(
+            self.request.GET.get(CURSOR_PAGE_KWARG)
+        )
+        return context
+
+    def render_to_response(self, context, **response_kwargs):
+        if self.request.GET.get('format') != 'json':
+            return super().render_to_response(context, **response_kwargs)
+        comments = context['comments']
+        return JsonResponse({
+            'comments': [
+                {
+                    'id': comment.id,
+                    'author': comment.author.username,
+                    'text': comment.text,
+                    'created_at': comment.created_at.isoformat(),
+                }
+                for comment in comments
+            ],
+            'next': comments.next_cursor,
+        })
+
+
+class PostCreateView(StickyPrimaryMixin, LoginRequiredMixin, ProfileUrlMixin,
+                     PostImageMixin, SerializedWriteMixin, CreateView):
     model = Post
     form_class = PostForm
 
@@ -46,7 +92,9 @@ class PostCreateView(LoginRequiredMixin, ProfileUrlMixin, CreateView):
         return super().form_valid(form)
 
 
-class PostUpdateView(PostDispatchMixin, LoginRequiredMixin, UpdateView):
+class PostUpdateView(StickyPrimaryMixin, PostDispatchMixin,
+                     LoginRequiredMixin, PostImageMixin, SerializedWriteMixin,
+                     UpdateView):
     model = Post
     form_class = PostForm
 
@@ -57,95 +105,113 @@ class PostUpdateView(PostDispatchMixin, LoginRequiredMixin, UpdateView):
         )
 
 
-class PostDeleteView(PostDispatchMixin, LoginRequiredMixin, DeleteView):
+class PostDeleteView(StickyPrimaryMixin, PostDispatchMixin,
+                     LoginRequiredMixin, SerializedWriteMixin, DeleteView):
     model = Post
     template_name = 'blog/post_form.html'
     success_url = reverse_lazy('blog:index')
 
 
-class CategoryListView(ListView, PaginatorMixin):
+class CategoryListView(ReplicaReadMixin, ConditionalGetMixin,
+                       AnonymousPageCacheMixin, ListView, PaginatorMixin):
     model = Category
 
-    def dispatch(self, request, *args, **kwargs):
-        self.category = get_object_or_404(
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['category'] = get_object_or_404(
             Category.objects
             .values('title', 'description'),
-            slug=kwargs['category_slug'],
+            slug=self.kwargs['category_slug'],
             is_published=True
         )
-        self.post_list = (
+        context['post_list'] = (
             Post.published.all()
-            .filter(category__slug=kwargs['category_slug'])
+            .filter(category__slug=self.kwargs['category_slug'])
         )
-        return super().dispatch(request, *args, **kwargs)
+        return self.setup_pagination(context)
+
+
+class PostSearchView(ReplicaReadMixin, AnonymousPageCacheMixin,
+                     PaginatorMixin, ListView):
+    model = Post
+    template_name = 'blog/search.html'
+    cache_query_params = ('q', 'page', CURSOR_PAGE_KWARG)
+
+    def get_queryset(self):
+        query = self.request.GET.get('q', '').strip()
+        if not query:
+            return Post.objects.none()
+        return search_posts(Post.published.all(), query)
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['post_list'] = self.post_list
-        context['category'] = self.category
+        context['query'] = self.request.GET.get('q', '').strip()
         return self.setup_pagination(context)
 
 
-class ProfileCreateView(CreateView):
+class ProfileCreateView(StickyPrimaryMixin, SerializedWriteMixin,
+                        CreateView):
     form_class = UserCreationForm
     template_name = 'registration/registration_form.html'
     success_url = reverse_lazy('login')
 
 
-class ProfileListView(ListView, PaginatorMixin):
+class ProfileDetailView(ReplicaReadMixin, ConditionalGetMixin,
+                        PaginatorMixin, DetailView):
     model = User
+    slug_field = 'username'
+    slug_url_kwarg = 'username'
+    context_object_name = 'profile'
+    template_name = 'blog/profile.html'
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        username = self.kwargs['username']
-        context['profile'] = (
-            self.get_queryset()
-            .get(username=username)
-        )
         post_list = (
             Post.objects
             .related_table()
-            .count_comment()
+            .filter(author_id=self.object.pk)
             .order_by('-pub_date')
-            .filter(author_id__username=username)
-            .all()
         )
-        if self.request.user.username != username:
-            context['post_list'] = (
-                post_list.filter(pub_date__lt=tz.now())
-            )
-            return self.setup_pagination(context)
+        if self.request.user.pk != self.object.pk:
+            post_list = post_list.published()
         context['post_list'] = post_list
         return self.setup_pagination(context)
 
 
-class ProfileUpdateView(LoginRequiredMixin, ProfileUrlMixin, UpdateView):
+class ProfileUpdateView(StickyPrimaryMixin, LoginRequiredMixin,
+                        ProfileUrlMixin, SerializedWriteMixin, UpdateView):
     model = User
     form_class = ProfileForm
     slug_field = 'username'
     slug_url_kwarg = 'username'
 
 
-class CommentCreateView(LoginRequiredMixin, CommentMixin, CreateView):
+class CommentCreateView(StickyPrimaryMixin, LoginRequiredMixin,
+                        CommentFragmentMixin, CommentMixin,
+                        SerializedWriteMixin, CreateView):
+    fragment_status = 201
+
     def form_valid(self, form):
-        form.instance.author = (
-            get_object_or_404(User, username=self.request.user)
-        )
-        form.instance.post = (
-            get_object_or_404(
-                (Post.objects
-                 .related_table()
-                 .count_comment()),
-                pk=self.kwargs['pk'])
-        )
+        if not Post.objects.filter(pk=self.kwargs['pk']).exists():
+            raise Http404
+        form.instance.author = self.request.user
+        form.instance.post_id = self.kwargs['pk']
         return super().form_valid(form)
 
 
-class CommentUpdateView(LoginRequiredMixin, CommentObjectMixin,
-                        CommentDispatchMixin, CommentMixin, UpdateView):
+class CommentUpdateView(StickyPrimaryMixin, LoginRequiredMixin,
+                        CommentDispatchMixin, CommentFragmentMixin,
+                        CommentMixin, SerializedWriteMixin, UpdateView):
     ...
 
 
-class CommentDeleteView(LoginRequiredMixin, CommentDispatchMixin,
-                        CommentObjectMixin, CommentMixin, DeleteView):
+class CommentDeleteView(StickyPrimaryMixin, LoginRequiredMixin,
+                        CommentDispatchMixin, CommentFragmentMixin,
+                        CommentMixin, SerializedWriteMixin, DeleteView):
     template_name = 'blog/comment_form.html'
+
+    def delete(self, request, *args, **kwargs):
+        response = super().delete(request, *args, **kwargs)
+        if not self.is_fragment_request():
+            return response
+        return HttpResponse(status=204)
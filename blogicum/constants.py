@@ -6,3 +6,45 @@ PUB_DATE_HELP_TXT: str = ('Если установить дату и время
                           'можно делать отложенные публикации.')
 
 POST_PER_PAGE: int = 10
+COMMENT_PER_PAGE: int = 50
+
+CURSOR_PAGE_KWARG: str = 'cursor'
+CURSOR_SALT: str = 'blog.paginators.cursor'
+
+POST_CARD_CACHE_TIMEOUT: int = 60 * 60
+PAGE_CACHE_TIMEOUT: int = 60 * 10
+
+POST_IMAGE_VARIANTS: dict = {
+    'card': (640, 640),
+    'detail': (1280, 1280),
+}
+POST_IMAGE_FORMATS: dict = {
+    'jpg': 'JPEG',
+    'webp': 'WEBP',
+}
+POST_IMAGE_QUALITY: int = 80
+
+TASK_MAX_ATTEMPTS: int = 3
+TASK_RETRY_DELAY: int = 30
+TASK_VISIBILITY_TIMEOUT: int = 60 * 5
+
+EXPORT_CHUNK_SIZE: int = 2000
+
+ESTIMATED_COUNT_THRESHOLD: int = 10000
+
+PROFILING_SLOW_QUERIES: int = 5
+PROFILING_SQL_LENGTH: int = 200
+
+METRICS_FLUSH_INTERVAL: int = 5
+METRICS_BUCKETS: tuple = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10
+)
+
+REPLICA_STICKY_COOKIE: str = 'primary_reads'
+REPLICA_STICKY_SECONDS: int = 15
+
+SQLITE_WRITE_RETRIES: int = 5
+SQLITE_WRITE_RETRY_DELAY: float = 0.05
+
+STATIC_HASHED_MAX_AGE: int = 60 * 60 * 24 * 365
+STATIC_MAX_AGE: int = 60 * 10
@@ -0,0 +1,25 @@
+from django.contrib import admin
+
+from .models import Job
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = (
+        'task',
+        'status',
+        'attempts',
+        'run_at',
+        'created_at',
+        'finished_at',
+    )
+    list_filter = ('status', 'task')
+    readonly_fields = (
+        'task',
+        'args',
+        'kwargs',
+        'attempts',
+        'created_at',
+        'finished_at',
+        'last_error',
+    )
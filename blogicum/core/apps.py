@@ -1,6 +1,12 @@
 from django.apps import AppConfig
+from django.utils.module_loading import autodiscover_modules
 
 
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'core'
+    verbose_name = 'Ядро'
+
+    def ready(self):
+        from . import routers, sqlite  # noqa: F401
+        autodiscover_modules('tasks')
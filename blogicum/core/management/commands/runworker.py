@@ -0,0 +1,46 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+
+from core.models import Job
+from core.tasks import claim_jobs, run_job
+
+
+class Command(BaseCommand):
+    help = 'Запускает обработчик фоновых задач.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--threads',
+            type=int,
+            default=4,
+            help='Количество потоков-обработчиков.'
+        )
+        parser.add_argument(
+            '--poll',
+            type=float,
+            default=1.0,
+            help='Пауза между опросами очереди, в секундах.'
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Выполнить готовые задачи и завершиться.'
+        )
+
+    def handle(self, *args, **options):
+        with ThreadPoolExecutor(max_workers=options['threads']) as executor:
+            while True:
+                jobs = claim_jobs(limit=options['threads'] * 2)
+                for job in executor.map(run_job, jobs):
+                    self.report(job)
+                if options['once'] and not jobs:
+                    return
+                if not jobs:
+                    time.sleep(options['poll'])
+
+    def report(self, job):
+        style = (self.style.SUCCESS if job.status == Job.Status.DONE
+                 else self.style.WARNING)
+        self.stdout.write(style(f'{job.pk} {job}'))
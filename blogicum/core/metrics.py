@@ -0,0 +1,206 @@
+import atexit
+import fcntl
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from pathlib import Path
+
+from django.conf import settings
+
+from constants import METRICS_BUCKETS, METRICS_FLUSH_INTERVAL
+
+METRICS = {
+    'blog_http_requests_total': (
+        'counter', 'Количество запросов по представлениям.'),
+    'blog_http_request_duration_seconds': (
+        'histogram', 'Время обработки запроса по представлениям.'),
+    'blog_db_queries_total': (
+        'counter', 'Количество запросов к базе данных по представлениям.'),
+    'blog_cache_requests_total': (
+        'counter', 'Обращения к кешу страниц и карточек.'),
+    'blog_posts_created_total': (
+        'counter', 'Количество созданных публикаций.'),
+    'blog_comments_created_total': (
+        'counter', 'Количество созданных комментариев.'),
+    'blog_db_write_retries_total': (
+        'counter', 'Повторы записи из-за блокировки базы данных.'),
+}
+HISTOGRAM_SUFFIXES = ('_bucket', '_sum', '_count')
+ARCHIVE_NAME = 'archive.json'
+LOCK_NAME = 'metrics.lock'
+
+
+def sample_key(name, labels):
+    if not labels:
+        return name
+    rendered = ','.join(
+        f'{label}="{value}"' for label, value in sorted(labels.items())
+    )
+    return f'{name}{{{rendered}}}'
+
+
+def family_name(key):
+    name = key.split('{', 1)[0]
+    for suffix in HISTOGRAM_SUFFIXES:
+        family = name[:-len(suffix)]
+        if name.endswith(suffix) and family in METRICS:
+            return family
+    return name
+
+
+def format_value(value):
+    return str(int(value)) if value.is_integer() else repr(value)
+
+
+def read_values(path):
+    try:
+        return json.loads(path.read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def write_values(path, values):
+    temporary = path.with_suffix('.tmp')
+    temporary.write_text(json.dumps(values))
+    os.replace(temporary, path)
+
+
+def is_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+@contextmanager
+def locked(directory):
+    with open(directory / LOCK_NAME, 'a') as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def archive(directory, paths):
+    with locked(directory):
+        paths = [path for path in paths if path.exists()]
+        if not paths:
+            return
+        archive_path = directory / ARCHIVE_NAME
+        totals = defaultdict(float, read_values(archive_path))
+        for path in paths:
+            for key, value in read_values(path).items():
+                totals[key] += value
+        write_values(archive_path, totals)
+        for path in paths:
+            path.unlink()
+
+
+def archive_dead_processes(directory):
+    archive(directory, [
+        path for path in directory.glob('*.json')
+        if path.stem.isdigit() and not is_alive(int(path.stem))
+    ])
+
+
+class Registry:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.pid = os.getpid()
+        self.owner_pid = None
+        self.values = defaultdict(float)
+        self.flushed_at = time.monotonic()
+
+    def inc(self, name, amount=1, **labels):
+        with self.lock:
+            self.reset_after_fork()
+            self.values[sample_key(name, labels)] += amount
+        self.flush_if_due()
+
+    def observe(self, name, value, **labels):
+        with self.lock:
+            self.reset_after_fork()
+            for bucket in METRICS_BUCKETS:
+                if value <= bucket:
+                    self.values[sample_key(
+                        f'{name}_bucket', {**labels, 'le': bucket}
+                    )] += 1
+            self.values[sample_key(
+                f'{name}_bucket', {**labels, 'le': '+Inf'}
+            )] += 1
+            self.values[sample_key(f'{name}_sum', labels)] += value
+            self.values[sample_key(f'{name}_count', labels)] += 1
+        self.flush_if_due()
+
+    def reset_after_fork(self):
+        if self.pid != os.getpid():
+            self.pid = os.getpid()
+            self.values.clear()
+
+    def flush_if_due(self):
+        if time.monotonic() - self.flushed_at >= METRICS_FLUSH_INTERVAL:
+            self.flush()
+
+    def get_path(self):
+        return Path(settings.METRICS_DIR) / f'{self.pid}.json'
+
+    def flush(self):
+        with self.lock:
+            self.reset_after_fork()
+            snapshot = dict(self.values)
+            self.flushed_at = time.monotonic()
+        path = self.get_path()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if self.owner_pid != self.pid:
+            archive(path.parent, [path])
+            self.owner_pid = self.pid
+        write_values(path, snapshot)
+
+    def close(self):
+        with self.lock:
+            self.reset_after_fork()
+            pending = bool(self.values)
+        if not pending and self.owner_pid != self.pid:
+            return
+        self.flush()
+        path = self.get_path()
+        archive(path.parent, [path])
+        with self.lock:
+            self.values.clear()
+            self.owner_pid = None
+
+
+registry = Registry()
+atexit.register(registry.close)
+
+
+def collect():
+    registry.flush()
+    directory = Path(settings.METRICS_DIR)
+    archive_dead_processes(directory)
+    totals = defaultdict(float)
+    for path in directory.glob('*.json'):
+        for key, value in read_values(path).items():
+            totals[key] += value
+    return totals
+
+
+def render():
+    families = defaultdict(list)
+    for key, value in collect().items():
+        families[family_name(key)].append((key, value))
+    lines = []
+    for family in sorted(families):
+        kind, help_text = METRICS.get(family, ('untyped', ''))
+        lines.append(f'# HELP {family} {help_text}')
+        lines.append(f'# TYPE {family} {kind}')
+        for key, value in sorted(families[family]):
+            lines.append(f'{key} {format_value(value)}')
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,219 @@
+import heapq
+import json
+import logging
+import mimetypes
+import random
+import re
+import time
+from contextlib import ExitStack
+from pathlib import Path
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed, SuspiciousFileOperation
+from django.db import connections
+from django.http import FileResponse, HttpResponseNotModified
+from django.utils._os import safe_join
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.utils.http import http_date
+from django.views.static import was_modified_since
+
+from .metrics import registry
+from constants import (
+    PROFILING_SLOW_QUERIES, PROFILING_SQL_LENGTH, STATIC_HASHED_MAX_AGE,
+    STATIC_MAX_AGE
+)
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+STATIC_ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+HASHED_STATIC_NAME = re.compile(r'\.[0-9a-f]{12}\.[^./]+$')
+
+logger = logging.getLogger('blogicum.profiling')
+
+
+class RequestProfile:
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.slow_queries = []
+        self.render_started = None
+        self.render_time = 0.0
+
+    def record_query(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - started
+            self.queries += 1
+            self.db_time += duration
+            query = (duration, sql[:PROFILING_SQL_LENGTH])
+            if len(self.slow_queries) < PROFILING_SLOW_QUERIES:
+                heapq.heappush(self.slow_queries, query)
+            else:
+                heapq.heappushpop(self.slow_queries, query)
+
+    def start_render(self):
+        self.render_started = time.perf_counter()
+
+    def finish_render(self, response):
+        if self.render_started is not None:
+            self.render_time = time.perf_counter() - self.render_started
+
+
+class QueryCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+def milliseconds(seconds):
+    return round(seconds * 1000, 2)
+
+
+class ProfilingMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if random.random() >= settings.PROFILING_SAMPLE_RATE:
+            return self.get_response(request)
+        request.profile = profile = RequestProfile()
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(
+                    connection.execute_wrapper(profile.record_query)
+                )
+            response = self.get_response(request)
+        self.report(request, response, profile, time.perf_counter() - started)
+        return response
+
+    def process_template_response(self, request, response):
+        profile = getattr(request, 'profile', None)
+        if profile is not None:
+            profile.start_render()
+            response.add_post_render_callback(profile.finish_render)
+        return response
+
+    def report(self, request, response, profile, total_time):
+        match = request.resolver_match
+        size = None if response.streaming else len(response.content)
+        record = {
+            'method': request.method,
+            'path': request.path,
+            'view': match.view_name if match else None,
+            'status': response.status_code,
+            'queries': profile.queries,
+            'db_ms': milliseconds(profile.db_time),
+            'render_ms': milliseconds(profile.render_time),
+            'total_ms': milliseconds(total_time),
+            'size': size,
+            'slow_queries': [
+                {'ms': milliseconds(duration), 'sql': sql}
+                for duration, sql in sorted(profile.slow_queries, reverse=True)
+            ],
+        }
+        logger.info(json.dumps(record, ensure_ascii=False))
+        response['Server-Timing'] = ', '.join((
+            f'db;dur={record["db_ms"]};desc="{profile.queries} queries"',
+            f'tpl;dur={record["render_ms"]}',
+            f'total;dur={record["total_ms"]}',
+        ))
+
+
+class MetricsMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        counter = QueryCounter()
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(counter))
+            response = self.get_response(request)
+        match = request.resolver_match
+        view = match.view_name if match else 'unresolved'
+        registry.inc(
+            'blog_http_requests_total',
+            view=view,
+            method=request.method,
+            status=response.status_code
+        )
+        registry.observe(
+            'blog_http_request_duration_seconds',
+            time.perf_counter() - started,
+            view=view
+        )
+        registry.inc('blog_db_queries_total', counter.count, view=view)
+        return response
+
+
+def accepted_encodings(request):
+    return {
+        part.split(';')[0].strip()
+        for part in request.headers.get('Accept-Encoding', '').split(',')
+    }
+
+
+class StaticFilesMiddleware:
+    def __init__(self, get_response):
+        if settings.DEBUG or not settings.STATIC_ROOT:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if (request.method in ('GET', 'HEAD')
+                and request.path.startswith(settings.STATIC_URL)):
+            response = self.serve(
+                request, request.path[len(settings.STATIC_URL):]
+            )
+            if response is not None:
+                return response
+        return self.get_response(request)
+
+    def serve(self, request, name):
+        try:
+            path = Path(safe_join(settings.STATIC_ROOT, name))
+        except SuspiciousFileOperation:
+            return None
+        if not path.is_file():
+            return None
+        stat = path.stat()
+        if not was_modified_since(
+                request.headers.get('If-Modified-Since'),
+                stat.st_mtime, stat.st_size):
+            response = HttpResponseNotModified()
+        else:
+            response = self.file_response(request, path)
+        response['Last-Modified'] = http_date(stat.st_mtime)
+        patch_vary_headers(response, ('Accept-Encoding',))
+        if HASHED_STATIC_NAME.search(name):
+            patch_cache_control(
+                response, public=True, immutable=True,
+                max_age=STATIC_HASHED_MAX_AGE
+            )
+        else:
+            patch_cache_control(response, public=True, max_age=STATIC_MAX_AGE)
+        return response
+
+    def file_response(self, request, path):
+        content_type = mimetypes.guess_type(path.name)[0]
+        encodings = accepted_encodings(request)
+        content_encoding = None
+        for encoding, suffix in STATIC_ENCODINGS:
+            variant = path.with_name(path.name + suffix)
+            if encoding in encodings and variant.is_file():
+                path, content_encoding = variant, encoding
+                break
+        response = FileResponse(
+            path.open('rb'),
+            content_type=content_type or 'application/octet-stream'
+        )
+        del response['Content-Disposition']
+        if content_encoding is not None:
+            response['Content-Encoding'] = content_encoding
+        return response
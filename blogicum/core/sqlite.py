@@ -0,0 +1,43 @@
+import threading
+import time
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, OperationalError, connections
+from django.db import transaction
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+from .metrics import registry
+from constants import SQLITE_WRITE_RETRIES, SQLITE_WRITE_RETRY_DELAY
+
+LOCKED_ERRORS = ('database is locked', 'database table is locked')
+
+write_lock = threading.Lock()
+
+
+@receiver(connection_created)
+def tune_sqlite(sender, connection, **kwargs):
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        for pragma, value in settings.SQLITE_PRAGMAS.items():
+            cursor.execute(f'PRAGMA {pragma} = {value}')
+
+
+def is_locked(error):
+    return any(message in str(error) for message in LOCKED_ERRORS)
+
+
+def run_serialized(func, using=DEFAULT_DB_ALIAS):
+    connection = connections[using]
+    if connection.vendor != 'sqlite' or connection.in_atomic_block:
+        return func()
+    for attempt in range(SQLITE_WRITE_RETRIES):
+        try:
+            with write_lock, transaction.atomic(using=using):
+                return func()
+        except OperationalError as error:
+            if not is_locked(error) or attempt == SQLITE_WRITE_RETRIES - 1:
+                raise
+        registry.inc('blog_db_write_retries_total', database=using)
+        time.sleep(SQLITE_WRITE_RETRY_DELAY * 2 ** attempt)
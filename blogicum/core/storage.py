@@ -0,0 +1,36 @@
+import gzip
+from functools import partial
+from pathlib import Path
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_EXTENSIONS = (
+    '.css', '.js', '.svg', '.ico', '.json', '.map', '.txt', '.xml', '.html'
+)
+COMPRESSORS = [('.gz', partial(gzip.compress, compresslevel=9, mtime=0))]
+if brotli is not None:
+    COMPRESSORS.append(('.br', brotli.compress))
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run=dry_run, **options)
+        if dry_run:
+            return
+        names = set(paths).union(self.hashed_files.values())
+        for name in sorted(names):
+            if name.endswith(COMPRESSIBLE_EXTENSIONS):
+                self.compress(name)
+
+    def compress(self, name):
+        path = Path(self.path(name))
+        content = path.read_bytes()
+        for suffix, compress in COMPRESSORS:
+            compressed = compress(content)
+            if len(compressed) < len(content):
+                path.with_name(path.name + suffix).write_bytes(compressed)
@@ -0,0 +1,77 @@
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.db.models import F, Q
+from django.utils import timezone as tz
+
+from .models import Job
+from constants import TASK_RETRY_DELAY, TASK_VISIBILITY_TIMEOUT
+
+registry = {}
+
+
+def task(func):
+    func.task_name = f'{func.__module__}.{func.__name__}'
+    registry[func.task_name] = func
+    return func
+
+
+def enqueue(func, *args, **kwargs):
+    if settings.TASKS_ALWAYS_EAGER:
+        return func(*args, **kwargs)
+    return Job.objects.create(
+        task=func.task_name, args=list(args), kwargs=kwargs
+    )
+
+
+def ready_jobs(now, limit):
+    return list(
+        Job.objects
+        .filter(
+            Q(status=Job.Status.PENDING, run_at__lte=now)
+            | Q(
+                status=Job.Status.RUNNING,
+                run_at__lte=now - timedelta(seconds=TASK_VISIBILITY_TIMEOUT)
+            )
+        )
+        .values_list('pk', 'status', 'run_at')[:limit]
+    )
+
+
+def claim_jobs(limit):
+    now = tz.now()
+    claimed = []
+    for pk, status, run_at in ready_jobs(now, limit):
+        if Job.objects.filter(pk=pk, status=status, run_at=run_at).update(
+                status=Job.Status.RUNNING,
+                run_at=now,
+                attempts=F('attempts') + 1):
+            claimed.append(pk)
+    return list(Job.objects.filter(pk__in=claimed))
+
+
+def run_job(job):
+    close_old_connections()
+    try:
+        registry[job.task](*job.args, **job.kwargs)
+    except Exception:
+        job.last_error = traceback.format_exc()
+        if job.attempts < job.max_attempts:
+            job.status = Job.Status.PENDING
+            job.run_at = tz.now() + timedelta(
+                seconds=TASK_RETRY_DELAY * 2 ** (job.attempts - 1)
+            )
+        else:
+            job.status = Job.Status.FAILED
+            job.finished_at = tz.now()
+    else:
+        job.status = Job.Status.DONE
+        job.finished_at = tz.now()
+    finally:
+        job.save(update_fields=(
+            'status', 'run_at', 'last_error', 'finished_at'
+        ))
+        close_old_connections()
+    return job
@@ -10,6 +10,8 @@ from typing import (
 import pytest
 from django.apps import apps
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
 from django.db.models import Model, Field
 from django.forms import BaseForm
 from django.http import HttpResponse
@@ -17,6 +19,8 @@ from django.test import override_settings
 from django.test.client import Client
 from mixer.backend.django import mixer as _mixer
 
+from core.metrics import registry
+
 N_PER_FIXTURE = 3
 N_PER_PAGE = 10
 COMMENT_TEXT_DISPLAY_LEN_FOR_TESTS = 50
@@ -26,12 +30,85 @@ UrlRepr = NamedTuple('UrlRepr', [('url', str), ('repr', str)])
 TitledUrlRepr = TypeVar('TitledUrlRepr', bound=Tuple[UrlRepr, str])
 
 
+def pytest_addoption(parser):
+    group = parser.getgroup('benchmark')
+    group.addoption(
+        '--benchmark', action='store_true',
+        help='Run the benchmark suite on a large generated dataset.')
+    group.addoption(
+        '--benchmark-update', action='store_true',
+        help='Store measured values as the new benchmark baseline.')
+    group.addoption(
+        '--benchmark-scale', type=float, default=1.0,
+        help='Multiplier for the size of the generated dataset.')
+    group.addoption(
+        '--benchmark-threshold', type=float, default=1.5,
+        help='Allowed slowdown relative to the stored baseline.')
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        'markers', 'benchmark: slow performance checks, run with --benchmark')
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption('--benchmark'):
+        return
+    skip = pytest.mark.skip(reason='run with --benchmark')
+    for item in items:
+        if 'benchmark' in item.keywords:
+            item.add_marker(skip)
+
+
 @pytest.fixture(autouse=True)
 def enable_debug_false():
     with override_settings(DEBUG=False):
         yield
 
 
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path / 'media'
+    yield settings.MEDIA_ROOT
+
+
+@pytest.fixture(autouse=True)
+def metrics_dir(settings, tmp_path):
+    settings.METRICS_DIR = tmp_path / 'metrics'
+    settings.METRICS_DIR.mkdir()
+    registry.values.clear()
+    registry.owner_pid = None
+    yield settings.METRICS_DIR
+    registry.values.clear()
+    registry.owner_pid = None
+
+
+@pytest.fixture
+def sqlite_file_database(tmp_path):
+    aliases = []
+
+    def add(alias):
+        connections.databases[alias] = {
+            **connections.databases[DEFAULT_DB_ALIAS],
+            'NAME': str(tmp_path / f'{alias}.sqlite3'),
+        }
+        aliases.append(alias)
+        return alias
+
+    yield add
+    for alias in aliases:
+        connections[alias].close()
+        del connections[alias]
+        del connections.databases[alias]
+
+
 class SafeImportFromContextManager:
 
     def __init__(self, import_path: str,
@@ -342,8 +419,7 @@ def cleanup(request):
 
     for root, dirs, files in os.walk(image_dir):
         for filename in files:
-            if (filename.endswith('.jpg') or filename.endswith(
-                    '.gif') or filename.endswith('.png')):
+            if filename.endswith(('.jpg', '.gif', '.png', '.webp')):
                 file_path = os.path.join(root, filename)
                 if os.path.getmtime(file_path) >= start_time:
                     os.remove(file_path)
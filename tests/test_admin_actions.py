@@ -0,0 +1,76 @@
+import pytest
+
+from blog.models import Category, Post
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+
+def _run_action(admin_client, model_name, action, objs):
+    return admin_client.post(f'/admin/blog/{model_name}/', data={
+        'action': action,
+        '_selected_action': [obj.id for obj in objs],
+    })
+
+
+@pytest.mark.parametrize('model_name, factory, expected', (
+    ('post', 'blog.Post', 8),
+    ('category', 'blog.Category', 7),
+    ('location', 'blog.Location', 5),
+))
+@pytest.mark.parametrize('action', ('publish', 'unpublish'))
+def test_action_queries_do_not_grow_with_selection(
+        admin_client, mixer, model_name, factory, expected, action,
+        django_assert_num_queries):
+    for selected in (2, 4):
+        objs = mixer.cycle(selected).blend(factory)
+        if model_name == 'category':
+            for category in objs:
+                mixer.cycle(3).blend('blog.Post', category=category)
+        with django_assert_num_queries(expected):
+            response = _run_action(admin_client, model_name, action, objs)
+        assert response.status_code == 302
+
+
+def test_category_unpublish_cascades_in_one_update(
+        admin_client, post_with_published_location,
+        django_assert_num_queries):
+    post = post_with_published_location
+    assert Post.published.filter(pk=post.pk).exists()
+    with django_assert_num_queries(7):
+        _run_action(admin_client, 'category', 'unpublish', [post.category])
+    assert not Category.objects.get(pk=post.category_id).is_published
+    assert not Post.published.filter(pk=post.pk).exists(), (
+        'Убедитесь, что снятие категории с публикации через действие '
+        'админки убирает её посты из ленты.'
+    )
+    _run_action(admin_client, 'category', 'publish', [post.category])
+    assert Post.published.filter(pk=post.pk).exists()
+
+
+def test_post_actions_update_visibility(
+        admin_client, client, post_with_published_location):
+    post = post_with_published_location
+    assert post.title in client.get('/').content.decode('utf-8')
+    _run_action(admin_client, 'post', 'unpublish', [post])
+    assert post.title not in client.get('/').content.decode('utf-8'), (
+        'Убедитесь, что действие снятия с публикации сбрасывает кеш ленты.'
+    )
+    _run_action(admin_client, 'post', 'publish', [post])
+    assert Post.published.filter(pk=post.pk).exists()
+
+
+def test_category_page_has_no_post_inline(
+        admin_client, mixer, published_category):
+    mixer.cycle(30).blend('blog.Post', category=published_category)
+    response = admin_client.get(
+        f'/admin/blog/category/{published_category.id}/change/')
+    assert response.status_code == 200
+    content = response.content.decode('utf-8')
+    assert 'post_set-TOTAL_FORMS' not in content, (
+        'Убедитесь, что на странице категории в админке не выводятся '
+        'все её публикации.'
+    )
+    assert f'category__id__exact={published_category.id}' in content
+    assert 'Публикаций: 30' in content
@@ -0,0 +1,59 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from blog.paginators import EstimatedCountPaginator
+from blog.models import Post
+from constants import ESTIMATED_COUNT_THRESHOLD
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+
+@pytest.mark.parametrize('model_name, factory, expected', (
+    ('post', 'blog.Post', 8),
+    ('comment', 'blog.Comment', 4),
+))
+def test_changelist_queries_do_not_grow(
+        admin_client, mixer, model_name, factory, expected,
+        django_assert_num_queries):
+    url = f'/admin/blog/{model_name}/'
+    for rows in (5, 5):
+        mixer.cycle(rows).blend(factory)
+        with django_assert_num_queries(expected):
+            assert admin_client.get(url).status_code == 200
+
+
+def test_editable_category_choices_loaded_once(admin_client, mixer):
+    mixer.cycle(10).blend('blog.Post')
+    with CaptureQueriesContext(connection) as context:
+        admin_client.get('/admin/blog/post/')
+    choices = [
+        query for query in context.captured_queries
+        if query['sql'].startswith('SELECT "blog_category"."id"')
+    ]
+    assert len(choices) == 2, (
+        'Убедитесь, что категории на странице списка публикаций '
+        'загружаются один раз для фильтра и один раз для редактируемого '
+        'столбца, а не отдельно для каждой строки.'
+    )
+
+
+def test_estimated_count_for_unfiltered_changelist(mixer):
+    if connection.vendor != 'sqlite':
+        pytest.skip('Оценка проверяется на SQLite.')
+    mixer.cycle(3).blend('blog.Post')
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE')
+        cursor.execute(
+            'UPDATE sqlite_stat1 SET stat = %s WHERE tbl = %s',
+            (f'{ESTIMATED_COUNT_THRESHOLD * 5} 1', Post._meta.db_table))
+    paginator = EstimatedCountPaginator(Post.objects.order_by('pk'), 10)
+    assert paginator.count == ESTIMATED_COUNT_THRESHOLD * 5, (
+        'Убедитесь, что для больших таблиц пагинатор админки '
+        'использует оценку количества записей.'
+    )
+    filtered = EstimatedCountPaginator(
+        Post.objects.filter(is_published=True).order_by('pk'), 10)
+    assert filtered.count == Post.objects.filter(is_published=True).count()
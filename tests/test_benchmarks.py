@@ -0,0 +1,380 @@
+import json
+import platform
+import random
+import sqlite3
+import statistics
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import timedelta
+from functools import partial
+from pathlib import Path
+from typing import NamedTuple
+from unittest import mock
+
+import django
+import pytest
+from django.contrib.auth.hashers import make_password
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import OperationalError, connection, connections, transaction
+from django.template.backends.django import Template
+from django.test import Client
+from django.urls import get_resolver, reverse
+from django.utils import timezone as tz
+from faker import Faker
+
+from blog.models import Category, Comment, Location, Post, User
+from blog.search import naive_search, rebuild_index, search_posts
+from core.middleware import RequestProfile
+from core.sqlite import run_serialized
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+BASELINE_PATH = Path(__file__).parent / 'benchmark_baseline.json'
+DATASET_SIZE = {
+    'users': 2000,
+    'categories': 20,
+    'locations': 50,
+    'posts': 20000,
+    'comments': 60000,
+}
+BATCH_SIZE = 2000
+RUNS = 5
+SLACK_MS = 5.0
+WRITERS = 8
+WRITES_PER_WRITER = 50
+TIMINGS = ('db_ms', 'render_ms', 'total_ms')
+
+Dataset = NamedTuple('Dataset', [
+    ('author', User), ('commenter', User), ('post', Post),
+    ('comment', Comment), ('category', Category), ('query', str)])
+Measurement = NamedTuple('Measurement', [
+    ('queries', int), ('db_ms', float),
+    ('render_ms', float), ('total_ms', float)])
+
+
+def sized(config, name):
+    return max(1, int(
+        DATASET_SIZE[name] * config.getoption('--benchmark-scale')))
+
+
+def seed(config):
+    fake = Faker('ru_RU')
+    Faker.seed(0)
+    rnd = random.Random(0)
+    words = [fake.sentence(nb_words=5)[:-1] for _ in range(500)]
+    texts = [fake.paragraph(nb_sentences=6) for _ in range(500)]
+    now = tz.now()
+    password = make_password('benchmark')
+    User.objects.bulk_create(
+        (User(username=f'user{i}', email=f'user{i}@example.com',
+              password=password)
+         for i in range(sized(config, 'users'))),
+        batch_size=BATCH_SIZE)
+    Category.objects.bulk_create(
+        Category(title=rnd.choice(words), description=rnd.choice(texts),
+                 slug=f'category-{i}', is_published=rnd.random() < 0.9)
+        for i in range(sized(config, 'categories')))
+    Location.objects.bulk_create(
+        Location(name=rnd.choice(words), is_published=rnd.random() < 0.9)
+        for _ in range(sized(config, 'locations')))
+    users = list(User.objects.all())
+    categories = list(Category.objects.all())
+    locations = list(Location.objects.all())
+    authors = users[:max(1, len(users) // 10)]
+    Post.objects.bulk_create(
+        (Post(title=rnd.choice(words), text=rnd.choice(texts),
+              author=rnd.choice(authors),
+              category=rnd.choice(categories),
+              location=rnd.choice(locations),
+              pub_date=now - timedelta(minutes=rnd.randint(-10000, 500000)),
+              is_published=rnd.random() < 0.95)
+         for _ in range(sized(config, 'posts'))),
+        batch_size=BATCH_SIZE)
+    post_ids = list(Post.objects.values_list('pk', flat=True))
+    weights = [rnd.paretovariate(1.5) for _ in post_ids]
+    counts = Counter()
+
+    def comments():
+        for post_id in rnd.choices(
+                post_ids, weights, k=sized(config, 'comments')):
+            counts[post_id] += 1
+            yield Comment(text=rnd.choice(texts)[:512],
+                          author=rnd.choice(users), post_id=post_id)
+
+    Comment.objects.bulk_create(comments(), batch_size=BATCH_SIZE)
+    for post_id, total in counts.items():
+        Post.objects.filter(pk=post_id).update(comment_count=total)
+    Post.objects.refresh_visibility()
+    rebuild_index(connection.alias)
+    post = (
+        Post.published
+        .filter(category__is_published=True)
+        .order_by('-comment_count')
+        .first()
+    )
+    comment = post.comment_set.first()
+    return Dataset(
+        author=post.author, commenter=comment.author, post=post,
+        comment=comment, category=post.category,
+        query=max(post.title.split(), key=len))
+
+
+@pytest.fixture(scope='module')
+def dataset(request, django_db_setup, django_db_blocker):
+    with django_db_blocker.unblock():
+        yield seed(request.config)
+        call_command('flush', interactive=False, verbosity=0)
+
+
+def environment(config):
+    return {
+        'scale': config.getoption('--benchmark-scale'),
+        'runs': RUNS,
+        'python': platform.python_version(),
+        'django': django.get_version(),
+        'sqlite': sqlite3.sqlite_version,
+        'platform': platform.platform(),
+    }
+
+
+@pytest.fixture(scope='module')
+def baseline(request):
+    if not BASELINE_PATH.exists():
+        return {}
+    recorded = json.loads(BASELINE_PATH.read_text())
+    scale = request.config.getoption('--benchmark-scale')
+    if (recorded['environment']['scale'] != scale
+            and not request.config.getoption('--benchmark-update')):
+        pytest.skip(
+            'Базовые значения записаны для масштаба '
+            f'{recorded["environment"]["scale"]}, а не {scale}.')
+    return recorded['results']
+
+
+@pytest.fixture(scope='module')
+def results(request):
+    measured = {}
+    yield measured
+    if request.config.getoption('--benchmark-update') and measured:
+        BASELINE_PATH.write_text(json.dumps(
+            {'environment': environment(request.config),
+             'results': measured},
+            indent=2, sort_keys=True) + '\n')
+
+
+def routes(data):
+    post, comment = data.post, data.comment
+    return {
+        'blog:index': (reverse('blog:index'), None),
+        'blog:index_deep': (reverse('blog:index') + '?page=100', None),
+        'blog:post_detail': (
+            reverse('blog:post_detail', args=(post.pk,)), None),
+        'blog:comments': (reverse('blog:comments', args=(post.pk,)), None),
+        'blog:category_posts': (
+            reverse('blog:category_posts', args=(data.category.slug,)), None),
+        'blog:profile': (
+            reverse('blog:profile', args=(data.author.username,)), None),
+        'blog:create_post': (reverse('blog:create_post'), data.author),
+        'blog:edit_post': (
+            reverse('blog:edit_post', args=(post.pk,)), data.author),
+        'blog:delete_post': (
+            reverse('blog:delete_post', args=(post.pk,)), data.author),
+        'blog:edit_profile': (
+            reverse('blog:edit_profile', args=(data.author.username,)),
+            data.author),
+        'blog:add_comment': (
+            reverse('blog:add_comment', args=(post.pk,)), data.commenter),
+        'blog:edit_comment': (
+            reverse('blog:edit_comment', args=(post.pk, comment.pk)),
+            data.commenter),
+        'blog:delete_comment': (
+            reverse('blog:delete_comment', args=(post.pk, comment.pk)),
+            data.commenter),
+        'blog:search': (
+            reverse('blog:search') + f'?q={data.query}', None),
+        'pages:about': (reverse('pages:about'), None),
+        'pages:rules': (reverse('pages:rules'), None),
+    }
+
+
+ROUTE_NAMES = (
+    'blog:index', 'blog:index_deep', 'blog:post_detail', 'blog:comments',
+    'blog:category_posts', 'blog:profile', 'blog:create_post',
+    'blog:edit_post', 'blog:delete_post', 'blog:edit_profile',
+    'blog:add_comment', 'blog:edit_comment', 'blog:delete_comment',
+    'blog:search', 'pages:about', 'pages:rules',
+)
+
+
+@contextmanager
+def render_timer():
+    original = Template.render
+    state = {'depth': 0, 'ms': 0.0}
+
+    def render(self, *args, **kwargs):
+        state['depth'] += 1
+        start = time.perf_counter()
+        try:
+            return original(self, *args, **kwargs)
+        finally:
+            state['depth'] -= 1
+            if not state['depth']:
+                state['ms'] += (time.perf_counter() - start) * 1000
+
+    with mock.patch.object(Template, 'render', render):
+        yield state
+
+
+def measure(client, url):
+    samples = []
+    client.get(url)
+    for _ in range(RUNS):
+        cache.clear()
+        profile = RequestProfile()
+        with connection.execute_wrapper(profile.record_query), \
+                render_timer() as render:
+            start = time.perf_counter()
+            response = client.get(url)
+            total_ms = (time.perf_counter() - start) * 1000
+        assert response.status_code == 200, (
+            f'Убедитесь, что страница `{url}` загружается без ошибок.')
+        samples.append(Measurement(
+            queries=profile.queries,
+            db_ms=profile.db_time * 1000,
+            render_ms=render['ms'],
+            total_ms=total_ms))
+    return Measurement(
+        queries=max(sample.queries for sample in samples),
+        **{name: round(statistics.median(
+            getattr(sample, name) for sample in samples), 2)
+           for name in TIMINGS})
+
+
+def test_every_route_is_benchmarked():
+    resolver = get_resolver()
+    names = {
+        f'{namespace}:{name}'
+        for namespace in ('blog', 'pages')
+        for name in resolver.namespace_dict[namespace][1].reverse_dict
+        if isinstance(name, str)
+    }
+    missing = names - set(ROUTE_NAMES)
+    assert not missing, (
+        f'Добавьте в набор бенчмарков маршруты: {", ".join(sorted(missing))}.')
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize('name', ROUTE_NAMES)
+def test_route_performance(name, request, dataset, baseline, results):
+    url, user = routes(dataset)[name]
+    client = Client()
+    if user is not None:
+        client.force_login(user)
+    measured = measure(client, url)
+    results[name] = measured._asdict()
+    expected = baseline.get(name)
+    if expected is None or request.config.getoption('--benchmark-update'):
+        return
+    assert measured.queries <= expected['queries'], (
+        f'Количество запросов к БД на странице `{url}` выросло: '
+        f'{measured.queries} вместо {expected["queries"]}.')
+    threshold = request.config.getoption('--benchmark-threshold')
+    for metric in TIMINGS:
+        limit = expected[metric] * threshold + SLACK_MS
+        assert getattr(measured, metric) <= limit, (
+            f'Страница `{url}` стала медленнее: {metric} = '
+            f'{getattr(measured, metric)} при допустимых {limit:.2f}.')
+
+
+@pytest.mark.benchmark
+def test_search_beats_icontains(dataset, results):
+    timings = {}
+    for name, search in (('fts', search_posts), ('icontains', naive_search)):
+        samples = []
+        for _ in range(RUNS):
+            queryset = search(Post.published.all(), dataset.query)
+            start = time.perf_counter()
+            queryset.count()
+            list(queryset[:10])
+            samples.append((time.perf_counter() - start) * 1000)
+        timings[name] = round(statistics.median(samples), 2)
+        results[f'search:{name}'] = {'total_ms': timings[name]}
+    assert timings['fts'] <= timings['icontains'], (
+        'Убедитесь, что полнотекстовый поиск работает быстрее, '
+        f'чем поиск через `icontains`: {timings}.'
+    )
+
+
+def write_comment(alias):
+    with connections[alias].cursor() as cursor:
+        cursor.execute('SELECT comment_count FROM post WHERE id = 1')
+        cursor.execute(
+            'INSERT INTO comment (post_id, text) VALUES (1, %s)', ['Текст'])
+        cursor.execute(
+            'UPDATE post SET comment_count = comment_count + 1 '
+            'WHERE id = 1')
+
+
+def unserialized(func, using):
+    with transaction.atomic(using=using):
+        return func()
+
+
+def write_throughput(alias, write):
+    with connections[alias].cursor() as cursor:
+        cursor.execute(
+            'CREATE TABLE post (id INTEGER PRIMARY KEY, comment_count INT)')
+        cursor.execute(
+            'CREATE TABLE comment (id INTEGER PRIMARY KEY, '
+            'post_id INT, text TEXT)')
+        cursor.execute('INSERT INTO post VALUES (1, 0)')
+    errors = []
+
+    def writer():
+        try:
+            for _ in range(WRITES_PER_WRITER):
+                try:
+                    write(partial(write_comment, alias), using=alias)
+                except OperationalError as error:
+                    errors.append(error)
+        finally:
+            connections[alias].close()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(WRITERS) as executor:
+        for future in [executor.submit(writer) for _ in range(WRITERS)]:
+            future.result()
+    elapsed = time.perf_counter() - start
+    with connections[alias].cursor() as cursor:
+        cursor.execute(
+            'SELECT COUNT(*), MAX(comment_count) FROM comment, post')
+        written, counted = cursor.fetchone()
+    return {
+        'writes_per_s': round(written / elapsed, 2),
+        'errors': len(errors),
+        'consistent': written == counted,
+    }
+
+
+@pytest.mark.benchmark
+def test_concurrent_sqlite_writes(sqlite_file_database, settings, results):
+    tuned_pragmas = settings.SQLITE_PRAGMAS
+    settings.SQLITE_PRAGMAS = {}
+    before = write_throughput(sqlite_file_database('before'), unserialized)
+    settings.SQLITE_PRAGMAS = tuned_pragmas
+    after = write_throughput(sqlite_file_database('after'), run_serialized)
+    results['sqlite_writes:before'] = before
+    results['sqlite_writes:after'] = after
+    assert after['errors'] == 0 and after['consistent'], (
+        'Убедитесь, что одновременные записи в SQLite не завершаются '
+        f'ошибкой «database is locked»: {after}.'
+    )
+    assert after['writes_per_s'] >= before['writes_per_s'], (
+        'Убедитесь, что настройка SQLite увеличивает скорость записи: '
+        f'{before} -> {after}.'
+    )
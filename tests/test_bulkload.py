@@ -0,0 +1,154 @@
+import gzip
+import json
+from datetime import datetime
+from io import StringIO
+from unittest import mock
+
+import pytest
+import pytz
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from blog.management.commands.bulkload import iter_records
+from blog.models import Category, Comment, Location, Post, User
+
+pytestmark = [
+    pytest.mark.django_db(transaction=True)
+]
+
+DB_JSON = settings.BASE_DIR.parent / 'db.json'
+
+
+def load(*paths, **options):
+    call_command('bulkload', *map(str, paths), **options)
+
+
+def test_bulkload_matches_dump():
+    records = [
+        record for record in json.loads(DB_JSON.read_text(encoding='utf-8'))
+        if record['model'].startswith(('blog.', 'auth.user'))
+    ]
+    load(DB_JSON, batch_size=7)
+    for model in (Category, Location, Post, User):
+        expected = sum(
+            record['model'] == model._meta.label_lower
+            for record in records
+        )
+        assert model.objects.count() == expected, (
+            'Убедитесь, что команда `bulkload` загружает все записи '
+            f'модели `{model.__name__}` из фикстуры.'
+        )
+    category = next(
+        record for record in records if record['model'] == 'blog.category')
+    assert Category.objects.get(
+        pk=category['pk']
+    ).created_at == datetime.fromisoformat(
+        category['fields']['created_at'].replace('Z', '+00:00')
+    ).astimezone(pytz.UTC), (
+        'Убедитесь, что команда `bulkload` сохраняет значения полей '
+        'с `auto_now_add` из фикстуры.'
+    )
+    new_category = Category.objects.create(
+        title='Новая', description='Описание', slug='new-category')
+    assert new_category.pk > category['pk']
+
+
+def test_bulkload_streams_gzipped_jsonl(tmp_path, mixer):
+    post = mixer.blend('blog.Post')
+    path = tmp_path / 'comments.jsonl.gz'
+    with gzip.open(path, 'wt', encoding='utf-8') as stream:
+        for pk in range(1, 6):
+            stream.write(json.dumps({
+                'model': 'blog.comment',
+                'pk': pk,
+                'fields': {
+                    'text': f'Комментарий {pk}',
+                    'author': post.author_id,
+                    'post': post.pk,
+                    'is_published': True,
+                    'created_at': '2023-01-01T00:00:00Z',
+                },
+            }) + '\n')
+    load(path, batch_size=2)
+    assert Comment.objects.filter(post=post).count() == 5
+    post.refresh_from_db()
+    assert post.comment_count == 5, (
+        'Убедитесь, что после загрузки комментариев команда `bulkload` '
+        'пересчитывает количество комментариев у публикаций.'
+    )
+
+
+@mock.patch('blog.management.commands.bulkload.CHUNK_SIZE', 7)
+def test_iter_records_across_small_chunks():
+    records = [{'model': 'blog.location', 'pk': pk} for pk in range(50)]
+    stream = StringIO(json.dumps(records, indent=2))
+    assert list(iter_records(stream)) == records
+
+
+@mock.patch('blog.management.commands.bulkload.CHUNK_SIZE', 5)
+def test_iter_records_reports_location():
+    stream = StringIO('[\n{"pk": 1},\n{"pk": 2},\n{"pk": }\n]')
+    with pytest.raises(CommandError, match='строка 4, смещение 31'):
+        list(iter_records(stream))
+
+
+def test_iter_records_limits_record_size():
+    stream = StringIO('{"pk": 1}\n{"text": "' + 'x' * 1000)
+    with pytest.raises(CommandError, match='строка 2, смещение 10'):
+        list(iter_records(stream, max_size=100))
+
+
+def test_bulkload_mixes_records_with_and_without_pk(tmp_path):
+    path = tmp_path / 'locations.json'
+    path.write_text(json.dumps([
+        {'model': 'blog.location', 'fields': {
+            'name': 'Без ключа', 'is_published': True,
+            'created_at': '2023-01-01T00:00:00Z'}},
+        {'model': 'blog.location', 'pk': 42, 'fields': {
+            'name': 'С ключом', 'is_published': True,
+            'created_at': '2023-01-01T00:00:00Z'}},
+    ]), encoding='utf-8')
+    load(path)
+    assert Location.objects.get(pk=42).name == 'С ключом', (
+        'Убедитесь, что команда `bulkload` сохраняет первичные ключи, '
+        'даже если первая запись пачки загружается без ключа.'
+    )
+    assert Location.objects.filter(name='Без ключа').exists()
+
+
+def test_bulkload_conflict_is_command_error(tmp_path):
+    path = tmp_path / 'location.json'
+    path.write_text(json.dumps([
+        {'model': 'blog.location', 'pk': 7, 'fields': {
+            'name': 'Город', 'is_published': True,
+            'created_at': '2023-01-01T00:00:00Z'}},
+    ]), encoding='utf-8')
+    load(path)
+    with pytest.raises(CommandError, match='--ignore-conflicts'):
+        load(path)
+    load(path, ignore_conflicts=True)
+    assert Location.objects.count() == 1
+
+
+def test_bulkload_recounts_comments_in_target_database(
+        tmp_path, sqlite_file_database):
+    alias = sqlite_file_database('target')
+    primary, target = connections[DEFAULT_DB_ALIAS], connections[alias]
+    primary.ensure_connection()
+    target.ensure_connection()
+    primary.connection.backup(target.connection)
+    path = tmp_path / 'comments.json'
+    path.write_text(json.dumps([
+        {'model': 'blog.comment', 'pk': pk, 'fields': {
+            'text': f'Комментарий {pk}', 'author': 1, 'post': 1,
+            'is_published': True, 'created_at': '2023-01-01T00:00:00Z'}}
+        for pk in (1, 2)
+    ]), encoding='utf-8')
+    load(DB_JSON, path, database=alias)
+    assert Post.objects.using(alias).get(pk=1).comment_count == 2, (
+        'Убедитесь, что команда `bulkload` пересчитывает комментарии '
+        'в той базе данных, в которую загружает фикстуры.'
+    )
+    assert not Post.objects.exists()
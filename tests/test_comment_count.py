@@ -0,0 +1,154 @@
+import json
+from unittest import mock
+
+import pytest
+from django.conf import settings
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from blog.models import Comment, Post
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+DB_JSON = settings.BASE_DIR.parent / 'db.json'
+
+
+def _stored_count(post):
+    return Post.objects.values_list('comment_count', flat=True).get(pk=post.pk)
+
+
+def test_comment_count_follows_views(
+        user_client, user, post_with_published_location):
+    post = post_with_published_location
+    url = f'/posts/{post.id}/comment/'
+    user_client.post(url, data={'text': 'Первый'})
+    user_client.post(url, data={'text': 'Второй'})
+    assert _stored_count(post) == 2, (
+        'Убедитесь, что при создании комментария увеличивается '
+        'сохранённое количество комментариев публикации.'
+    )
+
+    comment = Comment.objects.filter(post=post).first()
+    user_client.post(f'/posts/{post.id}/delete_comment/{comment.id}/')
+    assert _stored_count(post) == 1, (
+        'Убедитесь, что при удалении комментария уменьшается '
+        'сохранённое количество комментариев публикации.'
+    )
+
+
+def test_comment_count_follows_is_published(
+        mixer, post_with_published_location):
+    post = post_with_published_location
+    comment = mixer.blend('blog.Comment', post=post, is_published=True)
+    assert _stored_count(post) == 1
+
+    comment = Comment.objects.get(pk=comment.pk)
+    comment.is_published = False
+    comment.save()
+    assert _stored_count(post) == 0, (
+        'Убедитесь, что снятый с публикации комментарий не учитывается.'
+    )
+    comment.save()
+    assert _stored_count(post) == 0
+
+    comment.is_published = True
+    comment.save()
+    assert _stored_count(post) == 1
+
+
+def test_card_shows_only_published_comments(
+        client, mixer, post_with_published_location):
+    post = post_with_published_location
+    mixer.cycle(2).blend('blog.Comment', post=post, is_published=True)
+    hidden = mixer.blend('blog.Comment', post=post, is_published=False)
+
+    def index_page():
+        return client.get('/').content.decode('utf-8')
+
+    assert 'Комментарии (2)' in index_page(), (
+        'Убедитесь, что в карточке публикации на главной странице '
+        'учитываются только опубликованные комментарии.'
+    )
+
+    hidden.is_published = True
+    hidden.save()
+    assert 'Комментарии (3)' in index_page(), (
+        'Убедитесь, что после публикации комментария счётчик в карточке '
+        'публикации увеличивается.'
+    )
+
+    for _ in range(2):
+        hidden.is_published = False
+        hidden.save()
+        assert 'Комментарии (2)' in index_page(), (
+            'Убедитесь, что после снятия комментария с публикации счётчик '
+            'в карточке публикации уменьшается ровно на один.'
+        )
+
+
+def test_recount_comments_repairs_drift(
+        mixer, post_with_published_location):
+    post = post_with_published_location
+    mixer.cycle(3).blend('blog.Comment', post=post, is_published=True)
+    Post.objects.filter(pk=post.pk).update(comment_count=42)
+    call_command('recount_comments', check=True)
+    assert _stored_count(post) == 42
+    call_command('recount_comments')
+    assert _stored_count(post) == 3
+
+
+def test_post_delete_skips_cascaded_comment_counts(
+        mixer, post_with_published_location):
+    post = post_with_published_location
+    mixer.cycle(3).blend('blog.Comment', post=post, is_published=True)
+    post = Post.objects.get(pk=post.pk)
+    with CaptureQueriesContext(connection) as queries:
+        post.delete()
+    assert not any(
+        query['sql'].startswith('UPDATE')
+        for query in queries.captured_queries
+    ), (
+        'Убедитесь, что при удалении публикации счётчик комментариев не '
+        'обновляется для каждого удаляемого комментария.'
+    )
+
+
+def test_failed_post_delete_keeps_counting(
+        mixer, post_with_published_location):
+    post = post_with_published_location
+    first, second = mixer.cycle(2).blend(
+        'blog.Comment', post=post, is_published=True)
+    with mock.patch('blog.signals.purge_pages', side_effect=RuntimeError), \
+            pytest.raises(RuntimeError), transaction.atomic():
+        Post.objects.get(pk=post.pk).delete()
+    assert _stored_count(post) == 2
+    Comment.objects.get(pk=first.pk).delete()
+    assert _stored_count(post) == 1, (
+        'Убедитесь, что после неудачного удаления публикации удаление '
+        'комментария по-прежнему уменьшает счётчик.'
+    )
+
+
+def test_loaddata_counts_comments(tmp_path):
+    call_command('loaddata', str(DB_JSON), verbosity=0)
+    post = Post.objects.get(pk=1)
+    post_record = next(
+        record for record in json.loads(DB_JSON.read_text(encoding='utf-8'))
+        if record['model'] == 'blog.post' and record['pk'] == post.pk
+    )
+    path = tmp_path / 'comments.json'
+    path.write_text(json.dumps([
+        {'model': 'blog.comment', 'pk': pk, 'fields': {
+            'text': f'Комментарий {pk}', 'author': post.author_id,
+            'post': post.pk, 'is_published': is_published,
+            'created_at': '2023-01-01T00:00:00Z'}}
+        for pk, is_published in ((1, True), (2, True), (3, False))
+    ] + [post_record]), encoding='utf-8')
+    call_command('loaddata', str(path), verbosity=0)
+    assert _stored_count(post) == 2, (
+        'Убедитесь, что после загрузки комментариев командой `loaddata` '
+        'сохранённое количество комментариев публикации пересчитывается.'
+    )
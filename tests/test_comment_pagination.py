@@ -0,0 +1,80 @@
+from datetime import datetime, timedelta
+
+import pytest
+import pytz
+
+from constants import COMMENT_PER_PAGE
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+
+@pytest.fixture
+def many_comments(mixer, post_with_published_location):
+    start = datetime.now(tz=pytz.UTC) - timedelta(days=1)
+    comments = mixer.cycle(COMMENT_PER_PAGE * 2 + 3).blend(
+        'blog.Comment', post=post_with_published_location, is_published=True)
+    for i, comment in enumerate(comments):
+        comment.created_at = start + timedelta(minutes=i // 2)
+        comment.save()
+    return comments
+
+
+def test_detail_shows_first_comment_page(
+        user_client, post_with_published_location, many_comments):
+    response = user_client.get(f'/posts/{post_with_published_location.id}/')
+    comments = response.context['comments']
+    assert [c.id for c in comments] == [
+        c.id for c in many_comments[:COMMENT_PER_PAGE]
+    ], (
+        'Убедитесь, что на странице публикации отображается только '
+        'первая страница комментариев, «от старых к новым».'
+    )
+    assert 'data-load-comments' in response.content.decode('utf-8')
+
+
+def test_load_more_walks_all_comments(
+        user_client, post_with_published_location, many_comments):
+    url = f'/posts/{post_with_published_location.id}/comments/'
+    seen, cursor = [], None
+    while True:
+        response = user_client.get(url, {'cursor': cursor} if cursor else {})
+        assert response.status_code == 200
+        page = response.context['comments']
+        seen.extend(comment.id for comment in page)
+        if not page.has_next():
+            break
+        cursor = page.next_cursor
+    assert seen == [comment.id for comment in many_comments], (
+        'Убедитесь, что подгрузка комментариев отдаёт каждый '
+        'комментарий ровно один раз.'
+    )
+
+
+def test_load_more_json(
+        user_client, post_with_published_location, many_comments):
+    url = f'/posts/{post_with_published_location.id}/comments/'
+    data = user_client.get(url, {'format': 'json'}).json()
+    assert len(data['comments']) == COMMENT_PER_PAGE
+    assert data['comments'][0]['id'] == many_comments[0].id
+    data = user_client.get(
+        url, {'format': 'json', 'cursor': data['next']}).json()
+    assert data['comments'][0]['id'] == many_comments[COMMENT_PER_PAGE].id
+
+
+def test_load_more_respects_visibility(
+        mixer, another_user_client, user, published_category):
+    post = mixer.blend(
+        'blog.Post', author=user, category=published_category,
+        is_published=False)
+    response = another_user_client.get(f'/posts/{post.id}/comments/')
+    assert response.status_code == 403
+    assert another_user_client.get('/posts/0/comments/').status_code == 404
+
+
+def test_detail_query_count_bounded(
+        another_user_client, post_with_published_location, many_comments,
+        django_assert_max_num_queries):
+    with django_assert_max_num_queries(4):
+        another_user_client.get(f'/posts/{post_with_published_location.id}/')
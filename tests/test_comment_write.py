@@ -0,0 +1,118 @@
+import pytest
+
+from blog.models import Comment
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+AJAX = {'HTTP_X_REQUESTED_WITH': 'XMLHttpRequest'}
+
+
+@pytest.fixture
+def comment(mixer, user, post_with_published_location):
+    return mixer.blend(
+        'blog.Comment', author=user, post=post_with_published_location)
+
+
+def test_create_comment_fragment(
+        user_client, user, post_with_published_location,
+        django_assert_num_queries):
+    post = post_with_published_location
+    user_client.get('/')
+    with django_assert_num_queries(4):
+        response = user_client.post(
+            f'/posts/{post.id}/comment/', data={'text': 'Фрагмент'}, **AJAX)
+    assert response.status_code == 201, (
+        'Убедитесь, что при AJAX-запросе создание комментария возвращает '
+        'код 201 вместо переадресации.'
+    )
+    comment = Comment.objects.get()
+    assert comment.author == user and comment.post_id == post.id
+    content = response.content.decode()
+    assert 'Фрагмент' in content and f'comment_{comment.id}' in content, (
+        'Убедитесь, что в ответ на AJAX-запрос возвращается HTML-фрагмент '
+        'нового комментария.'
+    )
+
+
+def test_create_comment_redirects_without_ajax(
+        user_client, post_with_published_location):
+    post = post_with_published_location
+    response = user_client.post(
+        f'/posts/{post.id}/comment/', data={'text': 'Обычный'})
+    assert response.status_code == 302
+    assert response['Location'] == f'/posts/{post.id}/'
+
+
+def test_create_comment_for_missing_post(user_client):
+    response = user_client.post(
+        '/posts/404/comment/', data={'text': 'Текст'}, **AJAX)
+    assert response.status_code == 404, (
+        'Убедитесь, что нельзя оставить комментарий к несуществующей '
+        'публикации.'
+    )
+    assert not Comment.objects.exists()
+
+
+def test_invalid_comment_fragment(user_client, post_with_published_location):
+    response = user_client.post(
+        f'/posts/{post_with_published_location.id}/comment/',
+        data={'text': ''}, **AJAX)
+    assert response.status_code == 400
+    assert 'text' in response.json()['errors'], (
+        'Убедитесь, что при AJAX-запросе ошибки формы возвращаются в JSON.'
+    )
+
+
+def test_edit_comment_reuses_dispatched_object(
+        user_client, comment, django_assert_num_queries):
+    url = f'/posts/{comment.post_id}/edit_comment/{comment.id}/'
+    user_client.get('/')
+    with django_assert_num_queries(3):
+        response = user_client.post(url, data={'text': 'Новый'}, **AJAX)
+    assert response.status_code == 200
+    assert 'Новый' in response.content.decode()
+
+
+def test_delete_comment_fragment(
+        user_client, comment, django_assert_num_queries):
+    url = f'/posts/{comment.post_id}/delete_comment/{comment.id}/'
+    user_client.get('/')
+    with django_assert_num_queries(4):
+        response = user_client.post(url, **AJAX)
+    assert response.status_code == 204
+    assert not Comment.objects.exists()
+
+
+@pytest.mark.parametrize('suffix', ('edit_comment', 'delete_comment'))
+def test_foreign_comment_is_forbidden(another_user_client, comment, suffix):
+    url = f'/posts/{comment.post_id}/{suffix}/{comment.id}/'
+    response = another_user_client.post(url, data={'text': 'Чужой'}, **AJAX)
+    assert response.status_code == 403
+    assert Comment.objects.get().text == comment.text
+
+
+def test_comment_must_belong_to_post(mixer, user_client, comment):
+    other_post = mixer.blend('blog.Post')
+    url = f'/posts/{other_post.id}/edit_comment/{comment.id}/'
+    response = user_client.post(url, data={'text': 'Чужой'})
+    assert response.status_code == 404, (
+        'Убедитесь, что комментарий редактируется только по адресу '
+        'своей публикации.'
+    )
+
+
+def test_new_comment_appended_to_list(
+        user_client, comment, post_with_published_location):
+    content = user_client.get(
+        f'/posts/{post_with_published_location.id}/').content.decode()
+    container = content.index('data-comment-list>')
+    assert container < content.index(f'comment_{comment.id}'), (
+        'Убедитесь, что комментарии выводятся внутри контейнера '
+        '`data-comment-list`.'
+    )
+    assert "insertAdjacentHTML('beforeend', html)" in content, (
+        'Убедитесь, что новый комментарий добавляется в конец списка '
+        'комментариев, а не сразу после формы.'
+    )
@@ -0,0 +1,125 @@
+from datetime import datetime, timedelta
+
+import pytest
+import pytz
+from django.test import Client
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+
+@pytest.fixture
+def urls(user, post_with_published_location):
+    post = post_with_published_location
+    return (
+        '/',
+        f'/category/{post.category.slug}/',
+        f'/profile/{user.username}/',
+        f'/posts/{post.id}/',
+    )
+
+
+def _etag(client, url):
+    response = client.get(url)
+    assert response.status_code == 200
+    assert not response.has_header('Last-Modified'), (
+        'Убедитесь, что страницы не отдают заголовок Last-Modified: '
+        'валидатором служит ETag, зависящий от пользователя.'
+    )
+    assert 'Cookie' in response['Vary']
+    return response['ETag']
+
+
+def test_not_modified_without_rendering(client, user_client, urls):
+    for current_client in (client, user_client):
+        for url in urls:
+            etag = _etag(current_client, url)
+            response = current_client.get(url, HTTP_IF_NONE_MATCH=etag)
+            assert response.status_code == 304, (
+                f'Убедитесь, что страница `{url}` отвечает 304 Not Modified '
+                'на запрос с актуальным ETag.'
+            )
+            assert not response.content
+            assert not response.templates
+
+
+def test_if_modified_since_is_ignored(client, user_client, urls):
+    client.get(urls[0])
+    response = user_client.get(
+        urls[0], HTTP_IF_MODIFIED_SINCE='Fri, 01 Jan 2100 00:00:00 GMT')
+    assert response.status_code == 200, (
+        'Убедитесь, что страница не отвечает 304 по одному лишь '
+        'If-Modified-Since: содержимое зависит от пользователя.'
+    )
+
+
+def test_validator_depends_on_user(client, user_client, urls):
+    for url in urls:
+        assert _etag(client, url) != _etag(user_client, url)
+
+
+def _change_post(mixer, post, user):
+    post.title = 'Изменённый заголовок'
+    post.save()
+
+
+def _add_post(mixer, post, user):
+    mixer.blend('blog.Post', author=user, category=post.category)
+
+
+def _add_comment(mixer, post, user):
+    mixer.blend('blog.Comment', post=post, author=user)
+
+
+def _change_comment(mixer, post, user):
+    comment = mixer.blend('blog.Comment', post=post, author=user)
+    comment.text = 'Новый текст'
+    comment.save()
+
+
+def _change_category(mixer, post, user):
+    post.category.title = 'Новое название'
+    post.category.save()
+
+
+def _change_location(mixer, post, user):
+    post.location.name = 'Новое место'
+    post.location.save()
+
+
+def _change_profile(mixer, post, user):
+    user.first_name = 'Новое имя'
+    user.save()
+
+
+@pytest.mark.parametrize('write', (
+    _change_post, _add_post, _add_comment, _change_comment,
+    _change_category, _change_location, _change_profile,
+))
+def test_validator_changes_on_write(
+        write, mixer, user, user_client, post_with_published_location, urls):
+    before = {url: _etag(user_client, url) for url in urls}
+    write(mixer, post_with_published_location, user)
+    for url in urls:
+        assert _etag(user_client, url) != before[url], (
+            f'Убедитесь, что ETag страницы `{url}` меняется после '
+            f'изменения данных ({write.__name__}).'
+        )
+
+
+def test_validator_changes_when_scheduled_post_appears(
+        monkeypatch, mixer, user, urls, post_with_published_location):
+    pub_date = datetime.now(tz=pytz.UTC) + timedelta(hours=1)
+    mixer.blend(
+        'blog.Post', author=user, pub_date=pub_date,
+        category=post_with_published_location.category)
+    client = Client()
+    before = {url: _etag(client, url) for url in urls}
+    monkeypatch.setattr(
+        'django.utils.timezone.now', lambda: pub_date + timedelta(seconds=1))
+    for url in urls:
+        assert _etag(client, url) != before[url], (
+            f'Убедитесь, что ETag страницы `{url}` меняется, когда '
+            'наступает время отложенной публикации.'
+        )
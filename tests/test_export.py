@@ -0,0 +1,64 @@
+import csv
+import gzip
+import json
+from datetime import datetime, timedelta
+from io import StringIO
+
+import pytest
+import pytz
+from django.core.management import call_command
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+
+@pytest.fixture
+def dated_posts(mixer):
+    now = datetime.now(tz=pytz.UTC)
+    return mixer.cycle(4).blend(
+        'blog.Post',
+        pub_date=(now - timedelta(days=days) for days in (1, 2, 10, 20)),
+        comment_count=0,
+    )
+
+
+def test_export_posts_jsonl_in_date_range(dated_posts):
+    stdout, stderr = StringIO(), StringIO()
+    since = (datetime.now(tz=pytz.UTC) - timedelta(days=5)).isoformat()
+    call_command('export_blog', 'post', since=since,
+                 stdout=stdout, stderr=stderr)
+    rows = [json.loads(line) for line in stdout.getvalue().splitlines()]
+    assert sorted(row['id'] for row in rows) == sorted(
+        post.id for post in dated_posts[:2]), (
+        'Убедитесь, что команда `export_blog` выгружает публикации '
+        'только из заданного диапазона дат.'
+    )
+    assert rows[0]['author__username'] == dated_posts[0].author.username
+
+
+def test_export_comments_csv_gzip(tmp_path, mixer, dated_posts):
+    mixer.cycle(3).blend('blog.Comment', post=dated_posts[0])
+    path = tmp_path / 'comments.csv.gz'
+    call_command('export_blog', 'comment', format='csv', gzip=True,
+                 output=str(path), chunk_size=2, stderr=StringIO())
+    with gzip.open(path, 'rt', encoding='utf-8', newline='') as stream:
+        rows = list(csv.DictReader(stream))
+    assert len(rows) == 3, (
+        'Убедитесь, что команда `export_blog` выгружает комментарии '
+        'в сжатый CSV.'
+    )
+    assert {row['post_id'] for row in rows} == {str(dated_posts[0].id)}
+
+
+def test_admin_export_action_streams_csv(admin_client, dated_posts):
+    response = admin_client.post('/admin/blog/post/', data={
+        'action': 'export_csv',
+        '_selected_action': [post.id for post in dated_posts[:3]],
+    })
+    assert response.streaming, (
+        'Убедитесь, что действие выгрузки в админке отдаёт потоковый ответ.'
+    )
+    content = b''.join(response.streaming_content).decode()
+    rows = list(csv.DictReader(StringIO(content)))
+    assert len(rows) == 3
@@ -0,0 +1,36 @@
+import pytest
+from django.db import connection
+
+from blog.models import Comment, Post
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+
+def _feed_querysets(user, category, post):
+    return {
+        'post_published_feed_idx': Post.published.all()[:10],
+        'post_category_feed_idx': (
+            Post.published.filter(category__slug=category.slug)[:10]),
+        'post_author_feed_idx': (
+            Post.objects.filter(author_id=user.id).order_by('-pub_date')[:10]),
+        'comment_post_feed_idx': Comment.published.filter(post_id=post.id),
+    }
+
+
+@pytest.mark.skipif(
+    connection.vendor != 'sqlite', reason='План запроса проверяется в SQLite.')
+def test_feed_queries_use_indexes(
+        user, published_category, post_with_published_location):
+    for index_name, queryset in _feed_querysets(
+            user, published_category, post_with_published_location).items():
+        plan = queryset.explain()
+        assert index_name in plan, (
+            f'Убедитесь, что запрос использует индекс `{index_name}`. '
+            f'План запроса:\n{plan}'
+        )
+        assert 'TEMP B-TREE' not in plan, (
+            'Убедитесь, что сортировка ленты выполняется по индексу. '
+            f'План запроса:\n{plan}'
+        )
@@ -0,0 +1,129 @@
+import json
+import os
+import re
+
+import pytest
+
+from core.metrics import registry
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+
+TOKEN = 'secret'
+
+
+@pytest.fixture(autouse=True)
+def metrics_token(settings):
+    settings.METRICS_TOKEN = TOKEN
+
+
+def _scrape(client):
+    response = client.get(
+        '/metrics/', HTTP_AUTHORIZATION=f'Bearer {TOKEN}')
+    assert response.status_code == 200
+    return response.content.decode('utf-8')
+
+
+def _sample_total(text, name):
+    return float(re.search(
+        rf'^{re.escape(name)} (\S+)$', text, re.MULTILINE).group(1))
+
+
+def _sample(text, name, **labels):
+    pattern = re.escape(name) + r'\{([^}]*)\} (\S+)'
+    total = 0
+    for rendered, value in re.findall(pattern, text):
+        found = dict(re.findall(r'(\w+)="([^"]*)"', rendered))
+        if all(found.get(label) == str(v) for label, v in labels.items()):
+            total += float(value)
+    return total
+
+
+def test_metrics_endpoint_reports_views(
+        client, user_client, post_with_published_location,
+        django_capture_on_commit_callbacks):
+    client.get('/')
+    client.get('/')
+    post = post_with_published_location
+    with django_capture_on_commit_callbacks(execute=True):
+        user_client.post(
+            f'/posts/{post.id}/comment/', data={'text': 'Текст'})
+    text = _scrape(client)
+    assert _sample(text, 'blog_http_requests_total',
+                   view='blog:index', status=200) == 2, (
+        'Убедитесь, что эндпоинт `/metrics/` считает запросы '
+        'по именам представлений.'
+    )
+    assert _sample(text, 'blog_http_request_duration_seconds_bucket',
+                   view='blog:index', le='+Inf') == 2
+    assert _sample(text, 'blog_db_queries_total', view='blog:index') > 0
+    assert _sample(text, 'blog_cache_requests_total',
+                   cache='page', result='hit') == 1
+    assert 'blog_comments_created_total 1' in text
+    assert '# TYPE blog_http_request_duration_seconds histogram' in text
+
+
+def test_metrics_are_aggregated_across_processes(client, metrics_dir):
+    (metrics_dir / '999999.json').write_text(json.dumps(
+        {'blog_http_requests_total{method="GET",status="200",'
+         'view="blog:index"}': 5}))
+    client.get('/')
+    text = _scrape(client)
+    assert _sample(text, 'blog_http_requests_total', view='blog:index') == 6, (
+        'Убедитесь, что метрики суммируются по файлам всех процессов.'
+    )
+
+
+def test_metrics_token(settings, client):
+    assert client.get('/metrics/').status_code == 403
+    assert client.get(
+        '/metrics/', HTTP_AUTHORIZATION='Bearer wrong').status_code == 403
+    _scrape(client)
+
+
+def test_metrics_denied_without_token(settings, client):
+    settings.METRICS_TOKEN = ''
+    assert client.get('/metrics/').status_code == 403, (
+        'Убедитесь, что без настроенного токена эндпоинт `/metrics/` '
+        'закрыт.'
+    )
+    settings.DEBUG = True
+    assert client.get('/metrics/').status_code == 200
+
+
+def test_dead_process_files_are_archived(client, metrics_dir):
+    (metrics_dir / '999999.json').write_text(json.dumps(
+        {'blog_posts_created_total': 5}))
+    for _ in range(2):
+        text = _scrape(client)
+        assert _sample_total(text, 'blog_posts_created_total') == 5
+    assert not (metrics_dir / '999999.json').exists(), (
+        'Убедитесь, что файлы метрик завершившихся процессов удаляются.'
+    )
+
+
+def test_worker_exit_archives_own_file(client, metrics_dir):
+    registry.inc('blog_posts_created_total', 2)
+    registry.flush()
+    own_file = metrics_dir / f'{os.getpid()}.json'
+    assert own_file.exists()
+    registry.close()
+    assert not own_file.exists(), (
+        'Убедитесь, что при завершении процесса его файл метрик удаляется.'
+    )
+    assert _sample_total(_scrape(client), 'blog_posts_created_total') == 2
+
+
+def test_stale_file_of_same_pid_is_archived(client, metrics_dir):
+    own_file = metrics_dir / f'{os.getpid()}.json'
+    own_file.write_text(json.dumps({'blog_posts_created_total': 3}))
+    registry.inc('blog_posts_created_total')
+    registry.flush()
+    assert json.loads(own_file.read_text()) == {
+        'blog_posts_created_total': 1}
+    assert _sample_total(_scrape(client), 'blog_posts_created_total') == 4, (
+        'Убедитесь, что значения из оставшегося файла с тем же pid не '
+        'теряются и не перезаписываются.'
+    )
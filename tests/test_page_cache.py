@@ -0,0 +1,84 @@
+from datetime import datetime, timedelta
+
+import pytest
+import pytz
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+
+@pytest.mark.parametrize('url', ('/', 'category', 'detail'))
+def test_anonymous_page_served_from_cache(
+        url, client, post_with_published_location,
+        django_assert_num_queries):
+    post = post_with_published_location
+    url = {
+        'category': f'/category/{post.category.slug}/',
+        'detail': f'/posts/{post.id}/',
+    }.get(url, url)
+    first = client.get(url)
+    with django_assert_num_queries(0):
+        second = client.get(url)
+    assert second.content == first.content, (
+        'Убедитесь, что анонимным пользователям отдаётся '
+        'закешированная страница.'
+    )
+    assert dict(second.items()) == dict(first.items()), (
+        'Убедитесь, что закешированная страница отдаётся с теми же '
+        'заголовками, что и исходная.'
+    )
+
+
+def test_page_cache_varies_on_page_number(
+        client, many_posts_with_published_locations):
+    first = client.get('/')
+    second = client.get('/', {'page': 2})
+    assert first.content != second.content
+
+
+def test_authenticated_user_bypasses_cache(
+        user_client, post_with_published_location):
+    user_client.get('/')
+    response = user_client.get('/')
+    assert response.context is not None, (
+        'Убедитесь, что авторизованным пользователям страница '
+        'не отдаётся из кеша.'
+    )
+
+
+def test_page_cache_purged_on_write(
+        client, mixer, user, published_category,
+        post_with_published_location):
+    client.get('/')
+    new_post = mixer.blend(
+        'blog.Post', author=user, category=published_category,
+        is_published=True,
+        pub_date=datetime.now(tz=pytz.UTC) - timedelta(minutes=1))
+    assert new_post.title in client.get('/').content.decode('utf-8'), (
+        'Убедитесь, что кеш страниц сбрасывается при публикации поста.')
+
+
+def test_cached_json_keeps_content_type(
+        client, post_with_published_location):
+    url = f'/posts/{post_with_published_location.id}/comments/'
+    first = client.get(url, {'format': 'json'})
+    second = client.get(url, {'format': 'json'})
+    assert second.context is None
+    assert second['Content-Type'] == first['Content-Type']
+
+
+def test_scheduled_post_appears_without_purge(
+        monkeypatch, client, mixer, user, published_category,
+        post_with_published_location):
+    pub_date = datetime.now(tz=pytz.UTC) + timedelta(hours=1)
+    scheduled = mixer.blend(
+        'blog.Post', author=user, category=published_category,
+        is_published=True, pub_date=pub_date)
+    assert scheduled.title not in client.get('/').content.decode('utf-8')
+    monkeypatch.setattr(
+        'django.utils.timezone.now', lambda: pub_date + timedelta(seconds=1))
+    assert scheduled.title in client.get('/').content.decode('utf-8'), (
+        'Убедитесь, что отложенная публикация появляется в ленте, '
+        'как только наступает время её публикации.'
+    )
@@ -0,0 +1,96 @@
+from datetime import datetime, timedelta
+
+import pytest
+import pytz
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+
+from conftest import N_PER_PAGE
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+
+@pytest.fixture
+def many_posts(mixer, user, published_category):
+    now = datetime.now(tz=pytz.UTC)
+    return mixer.cycle(N_PER_PAGE * 2 + 5).blend(
+        'blog.Post', author=user, category=published_category,
+        is_published=True,
+        pub_date=(now - timedelta(hours=i) for i in range(1, 100)))
+
+
+def _walk(client, url):
+    seen, cursor, pages = [], None, 0
+    while True:
+        query = {} if cursor is None else {'cursor': cursor}
+        response = client.get(url, query)
+        page_obj = response.context['page_obj']
+        seen.extend(post.id for post in page_obj)
+        pages += 1
+        if not page_obj.has_next():
+            return seen, pages, page_obj
+        cursor = page_obj.next_cursor
+
+
+@override_settings(BLOG_CURSOR_PAGINATION=True)
+@pytest.mark.parametrize('url', ('/', 'category', 'profile'))
+def test_cursor_pagination_walks_feed(
+        url, client, user, published_category, many_posts):
+    url = {
+        'category': f'/category/{published_category.slug}/',
+        'profile': f'/profile/{user.username}/',
+    }.get(url, url)
+    seen, pages, last_page = _walk(client, url)
+    expected = [
+        post.id for post in
+        sorted(many_posts, key=lambda p: (p.pub_date, p.id), reverse=True)
+    ]
+    assert seen == expected, (
+        'Убедитесь, что курсорная пагинация отдаёт все публикации '
+        'ровно один раз, «от новых к старым».'
+    )
+    assert pages == 3
+
+    response = client.get(url, {'cursor': last_page.previous_cursor})
+    assert [post.id for post in response.context['page_obj']] == (
+        expected[N_PER_PAGE:N_PER_PAGE * 2]
+    ), 'Убедитесь, что ссылка на предыдущую страницу работает.'
+
+
+@override_settings(BLOG_CURSOR_PAGINATION=True)
+def test_cursor_pagination_skips_count(client, many_posts):
+    first = client.get('/').context['page_obj']
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get('/', {'cursor': first.next_cursor})
+    assert response.status_code == 200
+    for query in queries.captured_queries:
+        assert 'COUNT(*)' not in query['sql'], (
+            'Курсорная пагинация не должна выполнять COUNT(*) по ленте.')
+        assert 'OFFSET' not in query['sql'], (
+            'Курсорная пагинация не должна использовать OFFSET.')
+
+
+def test_invalid_cursor_falls_back_to_first_page(client, many_posts):
+    response = client.get('/', {'cursor': 'garbage'})
+    assert response.status_code == 200
+    assert len(response.context['page_obj']) == N_PER_PAGE
+
+
+def test_page_links_are_elided(client, mixer, user, published_category):
+    now = datetime.now(tz=pytz.UTC)
+    mixer.cycle(N_PER_PAGE * 20).blend(
+        'blog.Post', author=user, category=published_category,
+        is_published=True,
+        pub_date=(now - timedelta(hours=i) for i in range(1, 1000)))
+    content = client.get('/', {'page': 3}).content.decode('utf-8')
+    assert '…' in content, (
+        'Убедитесь, что пагинатор сокращает длинный список страниц.'
+    )
+    for page in (1, 6, 19, 20):
+        assert f'page={page}"' in content
+    assert 'page=10"' not in content, (
+        'Убедитесь, что пагинатор не выводит ссылки на все страницы.'
+    )
@@ -0,0 +1,62 @@
+import pytest
+from django.core.cache import cache
+
+from blog.cache import get_post_card_generation, post_card_key
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+
+def _card_is_cached(post):
+    return cache.get(
+        post_card_key(post.pk, get_post_card_generation())) is not None
+
+
+def test_warm_feed_reuses_cached_cards(
+        user_client, post_with_published_location):
+    post = post_with_published_location
+    user_client.get('/')
+    assert _card_is_cached(post), (
+        'Убедитесь, что карточка публикации сохраняется в кеш.')
+
+    cached = cache.get(post_card_key(post.pk, get_post_card_generation()))
+    cache.set(
+        post_card_key(post.pk, get_post_card_generation()),
+        cached.replace(post.title, 'из кеша'))
+    assert 'из кеша' in user_client.get('/').content.decode('utf-8'), (
+        'Убедитесь, что прогретая лента собирается из закешированных '
+        'карточек.')
+
+
+@pytest.mark.parametrize('change', ('post', 'category', 'location', 'comment'))
+def test_card_invalidated_on_related_write(
+        change, user_client, mixer, post_with_published_location):
+    post = post_with_published_location
+    user_client.get('/')
+    assert _card_is_cached(post)
+
+    if change == 'post':
+        post.title = 'Новый заголовок'
+        post.save()
+    elif change == 'category':
+        post.category.title = 'Новая категория'
+        post.category.save()
+    elif change == 'location':
+        post.location.name = 'Новое место'
+        post.location.save()
+    else:
+        mixer.blend('blog.Comment', post=post, is_published=True)
+
+    assert not _card_is_cached(post), (
+        'Убедитесь, что кеш карточки сбрасывается при изменении '
+        f'связанных данных ({change}).'
+    )
+    content = user_client.get('/').content.decode('utf-8')
+    expected = {
+        'post': 'Новый заголовок',
+        'category': 'Новая категория',
+        'location': 'Новое место',
+        'comment': 'Комментарии (1)',
+    }[change]
+    assert expected in content
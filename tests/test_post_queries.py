@@ -0,0 +1,43 @@
+import pytest
+
+from blog.cache import get_next_publication
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+
+@pytest.fixture
+def commented_post(mixer, post_with_published_location):
+    mixer.cycle(5).blend(
+        'blog.Comment', post=post_with_published_location)
+    get_next_publication()
+    return post_with_published_location
+
+
+@pytest.mark.parametrize('method, suffix, n_queries', (
+    ('get', '', 3),
+    ('get', 'edit/', 4),
+    ('get', 'delete/', 2),
+    ('post', 'delete/', 6),
+))
+def test_post_views_query_count(
+        method, suffix, n_queries, user_client, commented_post,
+        django_assert_num_queries):
+    url = f'/posts/{commented_post.id}/{suffix}'
+    with django_assert_num_queries(n_queries):
+        response = getattr(user_client, method)(url)
+    assert response.status_code in (200, 302), (
+        f'Убедитесь, что страница `{url}` загружается без ошибок.')
+
+
+def test_post_detail_query_count_does_not_grow(
+        mixer, another_user_client, commented_post,
+        django_assert_num_queries):
+    url = f'/posts/{commented_post.id}/'
+    with django_assert_num_queries(3):
+        another_user_client.get(url)
+    mixer.cycle(20).blend('blog.Comment', post=commented_post)
+    get_next_publication()
+    with django_assert_num_queries(3):
+        another_user_client.get(url)
@@ -0,0 +1,41 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+
+def test_unknown_profile_returns_404(client):
+    response = client.get('/profile/no-such-user/')
+    assert response.status_code == 404, (
+        'Убедитесь, что для несуществующего пользователя страница профиля '
+        'возвращает статус 404.'
+    )
+
+
+@pytest.mark.parametrize('as_author', (False, True))
+def test_profile_queries_do_not_grow_with_users(
+        as_author, mixer, user, user_client, client,
+        post_with_published_location):
+    viewer = user_client if as_author else client
+    url = f'/profile/{user.username}/'
+    viewer.get(url)
+    with CaptureQueriesContext(connection) as before:
+        viewer.get(url)
+    mixer.cycle(50).blend('auth.User')
+    viewer.get(url)
+    with CaptureQueriesContext(connection) as after:
+        response = viewer.get(url)
+    assert response.status_code == 200
+    assert len(after) == len(before), (
+        'Убедитесь, что количество запросов на странице профиля '
+        'не зависит от числа пользователей.'
+    )
+    for query in after.captured_queries:
+        if 'FROM "auth_user"' in query['sql']:
+            assert 'WHERE' in query['sql'] and 'LIMIT' in query['sql'], (
+                'Убедитесь, что страница профиля не загружает '
+                'всю таблицу пользователей.'
+            )
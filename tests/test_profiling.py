@@ -0,0 +1,33 @@
+import json
+import logging
+
+import pytest
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+
+def test_sampled_request_is_profiled(
+        settings, caplog, user_client, post_with_published_location):
+    settings.PROFILING_SAMPLE_RATE = 1
+    with caplog.at_level(logging.INFO, logger='blogicum.profiling'):
+        response = user_client.get('/')
+    assert 'db;dur=' in response['Server-Timing'], (
+        'Убедитесь, что для профилируемых запросов выставляется '
+        'заголовок `Server-Timing`.'
+    )
+    record = json.loads(caplog.records[-1].getMessage())
+    assert record['view'] == 'blog:index'
+    assert record['queries'] > 0
+    assert record['render_ms'] > 0
+    assert record['size'] == len(response.content)
+    assert record['slow_queries'][0]['sql'].startswith('SELECT')
+
+
+def test_unsampled_request_is_not_profiled(settings, caplog, client):
+    settings.PROFILING_SAMPLE_RATE = 0
+    with caplog.at_level(logging.INFO, logger='blogicum.profiling'):
+        response = client.get('/')
+    assert 'Server-Timing' not in response
+    assert not caplog.records
@@ -0,0 +1,107 @@
+import pytest
+from django.contrib.sessions.models import Session
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from blog.models import Post
+from constants import REPLICA_STICKY_COOKIE, REPLICA_STICKY_SECONDS
+from core.routers import ReplicaRouter, replica_reads
+
+pytestmark = [
+    pytest.mark.django_db(transaction=True)
+]
+
+REPLICA = 'replica'
+
+
+def sync_replica():
+    primary, replica = connections[DEFAULT_DB_ALIAS], connections[REPLICA]
+    primary.ensure_connection()
+    replica.ensure_connection()
+    primary.connection.backup(replica.connection)
+
+
+@pytest.fixture
+def replica(sqlite_file_database, settings):
+    settings.DATABASE_REPLICAS = [sqlite_file_database(REPLICA)]
+    return sync_replica
+
+
+def test_router_sends_only_marked_reads_to_replica(replica):
+    router = ReplicaRouter()
+    assert router.db_for_read(Post) == DEFAULT_DB_ALIAS
+    token = replica_reads.set(True)
+    try:
+        assert router.db_for_read(Post) == REPLICA
+        assert router.db_for_read(Session) == DEFAULT_DB_ALIAS
+        assert router.db_for_write(Post) == DEFAULT_DB_ALIAS
+    finally:
+        replica_reads.reset(token)
+    assert router.allow_migrate(REPLICA, 'blog') is False
+
+
+def test_authenticated_feed_reads_from_replica(
+        user_client, mixer, replica):
+    replica()
+    post = mixer.blend(
+        'blog.Post', title='Только на основной базе',
+        category__is_published=True, location__is_published=True)
+    assert Post.published.filter(pk=post.pk).exists()
+    response = user_client.get('/')
+    assert post.title not in response.content.decode(), (
+        'Убедитесь, что лента публикаций читается с реплики.'
+    )
+    assert not response.has_header('ETag'), (
+        'Убедитесь, что страницы, прочитанные с реплики, не получают '
+        'валидаторов кеширования.'
+    )
+    replica()
+    assert post.title in user_client.get('/').content.decode()
+
+
+@pytest.mark.parametrize('url', ('/', 'category', 'detail'))
+def test_anonymous_pages_not_cached_from_lagging_replica(
+        url, client, mixer, post_with_published_location, replica):
+    post = post_with_published_location
+    url = {
+        'category': f'/category/{post.category.slug}/',
+        'detail': f'/posts/{post.id}/',
+    }.get(url, url)
+    replica()
+    client.get(url)
+    post.title = 'Заголовок после записи'
+    post.save()
+    response = client.get(url)
+    assert post.title in response.content.decode(), (
+        'Убедитесь, что кеш страниц для анонимных пользователей не '
+        'заполняется данными отстающей реплики.'
+    )
+    assert response.has_header('ETag')
+
+
+def test_author_sticks_to_primary_after_write(
+        user_client, another_user_client, post_with_published_location,
+        replica):
+    post = post_with_published_location
+    replica()
+    response = user_client.post(
+        f'/posts/{post.id}/comment/', data={'text': 'Свежий комментарий'})
+    cookie = response.cookies[REPLICA_STICKY_COOKIE]
+    assert int(cookie['max-age']) == REPLICA_STICKY_SECONDS, (
+        'Убедитесь, что после записи автор на время закрепляется '
+        'за основной базой.'
+    )
+    url = f'/posts/{post.id}/'
+    assert 'Свежий комментарий' in user_client.get(url).content.decode(), (
+        'Убедитесь, что автор сразу видит свои изменения.'
+    )
+    assert 'Свежий комментарий' not in (
+        another_user_client.get(url).content.decode()
+    )
+
+
+def test_no_sticky_cookie_without_replicas(
+        user_client, post_with_published_location):
+    response = user_client.post(
+        f'/posts/{post_with_published_location.id}/comment/',
+        data={'text': 'Текст'})
+    assert REPLICA_STICKY_COOKIE not in response.cookies
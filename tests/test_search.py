@@ -0,0 +1,72 @@
+from datetime import datetime, timedelta
+
+import pytest
+import pytz
+
+from blog.models import Post
+from blog.search import search_posts
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+
+@pytest.fixture
+def searchable_post(mixer, user, published_category):
+    return mixer.blend(
+        'blog.Post', author=user, category=published_category,
+        is_published=True, title='Прогулка по набережной',
+        text='Вечером мы видели разводные мосты.',
+        pub_date=datetime.now(tz=pytz.UTC) - timedelta(days=1))
+
+
+def _found(client, query):
+    response = client.get('/search/', data={'q': query})
+    assert response.status_code == 200, (
+        'Убедитесь, что страница поиска `/search/` загружается без ошибок.')
+    return [post.id for post in response.context['page_obj']]
+
+
+@pytest.mark.parametrize('query', ('набережной', 'МОСТЫ', 'развод'))
+def test_search_finds_post(client, searchable_post, query):
+    assert _found(client, query) == [searchable_post.id], (
+        'Убедитесь, что поиск находит публикации по словам из заголовка '
+        'и текста без учёта регистра и по началу слова.'
+    )
+
+
+def test_search_respects_visibility(
+        client, searchable_post, mixer, user, published_category):
+    hidden = dict(author=user, title='Набережная', text='Текст')
+    mixer.blend('blog.Post', is_published=False,
+                category=published_category, **hidden)
+    mixer.blend('blog.Post', category=published_category,
+                pub_date=datetime.now(tz=pytz.UTC) + timedelta(days=1),
+                **hidden)
+    mixer.blend('blog.Post', category__is_published=False, **hidden)
+    assert _found(client, 'набережн') == [searchable_post.id], (
+        'Убедитесь, что поиск не показывает неопубликованные и '
+        'отложенные публикации, а также публикации из снятых категорий.'
+    )
+
+
+def test_search_index_follows_changes(searchable_post):
+    searchable_post.title = 'Поездка в горы'
+    searchable_post.text = 'Снег и солнце.'
+    searchable_post.save()
+    assert not search_posts(Post.objects.all(), 'набережной').exists()
+    assert search_posts(Post.objects.all(), 'горы').get() == searchable_post
+    searchable_post.delete()
+    assert not search_posts(Post.objects.all(), 'горы').exists(), (
+        'Убедитесь, что удалённые публикации пропадают из поискового индекса.'
+    )
+
+
+def test_search_handles_special_characters(client, searchable_post):
+    assert _found(client, '"мосты') == [searchable_post.id]
+    assert _found(client, '***') == []
+
+
+def test_admin_search_uses_index(admin_client, searchable_post):
+    response = admin_client.get('/admin/blog/post/', data={'q': 'мосты'})
+    assert list(response.context['cl'].result_list) == [searchable_post]
@@ -0,0 +1,183 @@
+from datetime import datetime, timedelta
+from io import BytesIO
+from unittest import mock
+
+import pytest
+import pytz
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import OperationalError, connections
+from PIL import Image
+
+from blog.models import Comment, Post
+from core.sqlite import run_serialized
+from constants import SQLITE_WRITE_RETRIES
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+
+@pytest.fixture
+def database(sqlite_file_database):
+    return sqlite_file_database('tuned')
+
+
+def pragma(alias, name):
+    with connections[alias].cursor() as cursor:
+        cursor.execute(f'PRAGMA {name}')
+        return cursor.fetchone()[0]
+
+
+def test_connection_is_tuned(database, settings):
+    assert pragma(database, 'journal_mode') == 'wal', (
+        'Убедитесь, что для SQLite включается журнал WAL.'
+    )
+    assert pragma(database, 'busy_timeout') == (
+        settings.SQLITE_PRAGMAS['busy_timeout'])
+    assert pragma(database, 'synchronous') == 1
+    assert pragma(database, 'mmap_size') == (
+        settings.SQLITE_PRAGMAS['mmap_size'])
+
+
+@mock.patch('core.sqlite.time.sleep')
+def test_locked_write_is_retried(sleep, database):
+    calls = []
+
+    def write():
+        calls.append(connections[database].in_atomic_block)
+        if len(calls) < 3:
+            raise OperationalError('database is locked')
+        return 'ok'
+
+    assert run_serialized(write, using=database) == 'ok'
+    assert calls == [True, True, True], (
+        'Убедитесь, что запись повторяется в транзакции, пока база '
+        'заблокирована.'
+    )
+    assert sleep.call_count == 2
+
+
+@mock.patch('core.sqlite.time.sleep')
+def test_retries_are_limited(sleep, database):
+    write = mock.Mock(side_effect=OperationalError('database is locked'))
+    with pytest.raises(OperationalError):
+        run_serialized(write, using=database)
+    assert write.call_count == SQLITE_WRITE_RETRIES
+
+
+def test_other_errors_are_not_retried(database):
+    write = mock.Mock(side_effect=OperationalError('no such table: blog'))
+    with pytest.raises(OperationalError):
+        run_serialized(write, using=database)
+    assert write.call_count == 1
+
+
+def locked_once(model):
+    save = model.save
+    calls = []
+
+    def flaky_save(self, *args, **kwargs):
+        calls.append(self.pk)
+        save(self, *args, **kwargs)
+        if len(calls) == 1:
+            raise OperationalError('database is locked')
+
+    return mock.patch.object(model, 'save', flaky_save), calls
+
+
+def post_data(category, location):
+    buffer = BytesIO()
+    Image.new('RGB', (64, 64)).save(buffer, 'PNG')
+    return {
+        'title': 'Повторная запись',
+        'text': 'Текст',
+        'pub_date': (
+            datetime.now(tz=pytz.UTC) - timedelta(days=1)
+        ).strftime('%Y-%m-%d'),
+        'category': category.id,
+        'location': location.id,
+        'is_published': True,
+        'image': SimpleUploadedFile(
+            'photo.png', buffer.getvalue(), content_type='image/png'),
+    }
+
+
+def stored_files(media_root):
+    return [path for path in (media_root / 'post').glob('*') if path.is_file()]
+
+
+@pytest.mark.django_db(transaction=True)
+@mock.patch('core.sqlite.time.sleep')
+def test_retried_post_create_stores_once(
+        sleep, media_root, user_client, published_category,
+        published_location):
+    patch, calls = locked_once(Post)
+    with patch:
+        response = user_client.post(
+            '/posts/create/',
+            data=post_data(published_category, published_location))
+    assert response.status_code == 302
+    assert len(calls) == 2, (
+        'Убедитесь, что заблокированная запись повторяется.'
+    )
+    assert calls[1] is None, (
+        'Убедитесь, что повторная попытка начинается с исходного '
+        'состояния объекта.'
+    )
+    assert Post.objects.count() == 1, (
+        'Убедитесь, что повтор записи не создаёт лишних публикаций.'
+    )
+    assert len(stored_files(media_root)) == 1, (
+        'Убедитесь, что повтор записи не сохраняет файл повторно.'
+    )
+    stored, = stored_files(media_root)
+    assert Post.objects.get().image.name == (
+        stored.relative_to(media_root).as_posix())
+
+
+@pytest.mark.django_db(transaction=True)
+@mock.patch('core.sqlite.time.sleep')
+def test_failed_post_create_removes_file(
+        sleep, media_root, user_client, published_category,
+        published_location):
+    data = post_data(published_category, published_location)
+    with mock.patch.object(
+            Post, 'save',
+            side_effect=OperationalError('database is locked')), \
+            pytest.raises(OperationalError):
+        user_client.post('/posts/create/', data=data)
+    assert not Post.objects.exists()
+    assert not stored_files(media_root), (
+        'Убедитесь, что файл неудавшейся публикации удаляется.'
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+@mock.patch('core.sqlite.time.sleep')
+def test_retried_comment_counted_once(
+        sleep, user_client, post_with_published_location):
+    post = post_with_published_location
+    patch, calls = locked_once(Comment)
+    with patch:
+        user_client.post(
+            f'/posts/{post.id}/comment/', data={'text': 'Текст'})
+    assert len(calls) == 2
+    assert Comment.objects.count() == 1
+    post.refresh_from_db()
+    assert post.comment_count == 1, (
+        'Убедитесь, что повторная попытка записи комментария не ломает '
+        'счётчик комментариев.'
+    )
+
+
+def test_invalid_form_is_rendered_without_write_lock(
+        user_client, post_with_published_location):
+    with mock.patch('blog.mixins.run_serialized') as serialized:
+        response = user_client.post(
+            f'/posts/{post_with_published_location.id}/comment/',
+            data={'text': ''})
+    assert response.status_code == 200
+    assert not serialized.called, (
+        'Убедитесь, что блокировка записи берётся только на время '
+        'сохранения, а не на весь запрос.'
+    )
@@ -0,0 +1,121 @@
+import gzip
+import re
+
+import pytest
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.management import call_command
+from django.test import override_settings
+
+from constants import STATIC_HASHED_MAX_AGE, STATIC_MAX_AGE
+from core.storage import CompressedManifestStaticFilesStorage
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+CSS = 'css/bootstrap.min.css'
+
+
+STORAGE = 'core.storage.CompressedManifestStaticFilesStorage'
+
+
+@pytest.fixture(scope='module')
+def static_root(tmp_path_factory):
+    root = tmp_path_factory.mktemp('static')
+    with override_settings(STATIC_ROOT=root, STATICFILES_STORAGE=STORAGE):
+        call_command(
+            'collectstatic', interactive=False, verbosity=0,
+            ignore_patterns=['admin', 'debug_toolbar'])
+    return root
+
+
+@pytest.fixture
+def collected(static_root, settings):
+    settings.STATIC_ROOT = static_root
+    settings.STATICFILES_STORAGE = STORAGE
+    return static_root
+
+
+@pytest.fixture
+def hashed_css(collected):
+    return staticfiles_storage.url(CSS)
+
+
+def test_templates_use_hashed_names(client, collected):
+    content = client.get('/').content.decode()
+    assert re.search(r'/static/img/logo\.[0-9a-f]{12}\.png', content), (
+        'Убедитесь, что ссылки на статические файлы содержат хеш содержимого.'
+    )
+
+
+def test_collectstatic_writes_compressed_siblings(collected, hashed_css):
+    name = hashed_css.removeprefix('/static/')
+    original = (collected / name).read_bytes()
+    assert gzip.decompress((collected / f'{name}.gz').read_bytes()) == (
+        original)
+    assert not (collected / 'img/logo.png.gz').exists(), (
+        'Убедитесь, что уже сжатые изображения не перепаковываются.'
+    )
+
+
+def test_hashed_asset_is_immutable(client, collected, hashed_css):
+    response = client.get(hashed_css, HTTP_ACCEPT_ENCODING='gzip, deflate')
+    assert response['Content-Encoding'] == 'gzip'
+    assert response['Content-Type'].startswith('text/css')
+    assert 'Accept-Encoding' in response['Vary']
+    cache_control = response['Cache-Control']
+    assert 'immutable' in cache_control, (
+        'Убедитесь, что файлы с хешем в имени кешируются навсегда.'
+    )
+    assert f'max-age={STATIC_HASHED_MAX_AGE}' in cache_control
+    body = gzip.decompress(b''.join(response.streaming_content))
+    assert body == (collected / CSS).read_bytes()
+
+
+def test_brotli_is_preferred(client, collected, hashed_css):
+    brotli = pytest.importorskip('brotli')
+    response = client.get(hashed_css, HTTP_ACCEPT_ENCODING='gzip, br')
+    assert response['Content-Encoding'] == 'br'
+    body = brotli.decompress(b''.join(response.streaming_content))
+    assert body == (collected / CSS).read_bytes()
+
+
+def test_plain_asset_without_accept_encoding(client, collected, hashed_css):
+    response = client.get(hashed_css)
+    assert 'Content-Encoding' not in response
+    assert b''.join(response.streaming_content) == (
+        (collected / CSS).read_bytes())
+
+
+def test_unhashed_asset_revalidates(client, collected):
+    url = f'/static/{CSS}'
+    response = client.get(url)
+    assert f'max-age={STATIC_MAX_AGE}' in response['Cache-Control']
+    assert 'immutable' not in response['Cache-Control']
+    response = client.get(
+        url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+    assert response.status_code == 304
+
+
+def test_static_root_is_not_escaped(client, collected):
+    (collected.parent / 'secret.txt').write_text('secret')
+    response = client.get('/static/../secret.txt')
+    assert response.status_code == 404
+
+
+def test_dry_run_keeps_manifest(settings, tmp_path):
+    settings.STATIC_ROOT = tmp_path
+    settings.STATICFILES_STORAGE = STORAGE
+    options = {
+        'interactive': False, 'verbosity': 0,
+        'ignore_patterns': ['admin', 'debug_toolbar'],
+    }
+    call_command('collectstatic', **options)
+    manifest = (tmp_path / 'staticfiles.json').read_text()
+    call_command('collectstatic', dry_run=True, **options)
+    assert (tmp_path / 'staticfiles.json').read_text() == manifest, (
+        'Убедитесь, что collectstatic --dry-run не перезаписывает '
+        'манифест статических файлов.'
+    )
+    storage = CompressedManifestStaticFilesStorage(location=tmp_path)
+    assert storage.stored_name(CSS) != CSS
@@ -0,0 +1,123 @@
+from datetime import timedelta
+from unittest import mock
+
+import pytest
+from django.core import mail
+from django.core.management import call_command
+from django.utils import timezone as tz
+
+from constants import TASK_VISIBILITY_TIMEOUT
+from core import tasks
+from core.models import Job
+from core.tasks import claim_jobs, enqueue, task
+
+pytestmark = [
+    pytest.mark.django_db(transaction=True)
+]
+
+calls = []
+
+
+@task
+def remember(value):
+    calls.append(value)
+
+
+@task
+def explode():
+    raise ValueError('Ошибка задачи')
+
+
+@pytest.fixture(autouse=True)
+def queued(settings):
+    settings.TASKS_ALWAYS_EAGER = False
+    calls.clear()
+
+
+def test_enqueue_creates_job():
+    job = enqueue(remember, 1)
+    assert calls == [], (
+        'Убедитесь, что при выключенном `TASKS_ALWAYS_EAGER` задача '
+        'не выполняется в момент постановки в очередь.'
+    )
+    assert job.status == Job.Status.PENDING
+    call_command('runworker', once=True, threads=2)
+    job.refresh_from_db()
+    assert calls == [1], (
+        'Убедитесь, что команда `runworker` выполняет задачи из очереди.'
+    )
+    assert job.status == Job.Status.DONE
+    assert job.attempts == 1
+
+
+def test_eager_mode_runs_immediately(settings):
+    settings.TASKS_ALWAYS_EAGER = True
+    enqueue(remember, 2)
+    assert calls == [2]
+    assert not Job.objects.exists()
+
+
+def test_failed_job_is_retried_then_failed():
+    job = enqueue(explode)
+    call_command('runworker', once=True)
+    job.refresh_from_db()
+    assert job.status == Job.Status.PENDING, (
+        'Убедитесь, что упавшая задача возвращается в очередь '
+        'для повторной попытки.'
+    )
+    assert 'Ошибка задачи' in job.last_error
+    for _ in range(job.max_attempts - 1):
+        Job.objects.filter(pk=job.pk).update(run_at=job.created_at)
+        call_command('runworker', once=True)
+    job.refresh_from_db()
+    assert job.status == Job.Status.FAILED, (
+        'Убедитесь, что после исчерпания попыток задача помечается '
+        'как неудачная.'
+    )
+    assert job.attempts == job.max_attempts
+
+
+@pytest.mark.parametrize('status, age', (
+    (Job.Status.PENDING, 0),
+    (Job.Status.RUNNING, TASK_VISIBILITY_TIMEOUT + 1),
+))
+def test_concurrent_claimers_claim_job_once(status, age):
+    job = enqueue(remember, 4)
+    Job.objects.filter(pk=job.pk).update(
+        status=status, run_at=tz.now() - timedelta(seconds=age))
+    ready_jobs = tasks.ready_jobs
+    second = []
+
+    def read_then_race(now, limit):
+        rows = ready_jobs(now, limit)
+        with mock.patch.object(tasks, 'ready_jobs', ready_jobs):
+            second.extend(claim_jobs(limit))
+        return rows
+
+    with mock.patch.object(tasks, 'ready_jobs', read_then_race):
+        first = claim_jobs(10)
+    assert [claimed.pk for claimed in second] == [job.pk]
+    assert first == [], (
+        'Убедитесь, что задачу, уже захваченную другим обработчиком, '
+        'нельзя захватить повторно.'
+    )
+    job.refresh_from_db()
+    assert job.attempts == 1
+
+
+def test_password_reset_email_is_queued(client, django_user_model):
+    django_user_model.objects.create_user(
+        username='reader', email='reader@example.com', password='pass'
+    )
+    response = client.post(
+        '/auth/password_reset/', data={'email': 'reader@example.com'}
+    )
+    assert response.status_code == 302
+    assert len(mail.outbox) == 0, (
+        'Убедитесь, что письмо для сброса пароля отправляется в фоне, '
+        'а не во время обработки запроса.'
+    )
+    assert Job.objects.filter(task='blog.tasks.send_email').exists()
+    call_command('runworker', once=True)
+    assert len(mail.outbox) == 1
+    assert mail.outbox[0].to == ['reader@example.com']
@@ -0,0 +1,141 @@
+from datetime import datetime, timedelta
+from io import BytesIO
+
+import pytest
+import pytz
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from PIL import Image
+
+from blog.images import variant_name
+from blog.models import Post
+from blog.tasks import make_post_image_variants
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+
+@pytest.fixture
+def big_image():
+    buffer = BytesIO()
+    Image.new('RGBA', (2400, 1600), (200, 10, 10, 128)).save(buffer, 'PNG')
+    return SimpleUploadedFile(
+        'big.png', buffer.getvalue(), content_type='image/png')
+
+
+def _create_post(user_client, category, location, image):
+    return user_client.post('/posts/create/', data={
+        'title': 'С картинкой',
+        'text': 'Текст',
+        'pub_date': (
+            datetime.now(tz=pytz.UTC) - timedelta(days=1)
+        ).strftime('%Y-%m-%d'),
+        'category': category.id,
+        'location': location.id,
+        'is_published': True,
+        'image': image,
+    })
+
+
+def test_variants_created_on_upload(
+        user_client, published_category, published_location, big_image,
+        django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        _create_post(
+            user_client, published_category, published_location, big_image)
+    post = Post.objects.get(title='С картинкой')
+    for variant, limit in (('card', 640), ('detail', 1280)):
+        for extension, image_format in (('jpg', 'JPEG'), ('webp', 'WEBP')):
+            name = post.image_variants[f'{variant}.{extension}']
+            assert default_storage.exists(name), (
+                'Убедитесь, что при загрузке изображения создаются '
+                f'уменьшенные копии ({name}).'
+            )
+            with default_storage.open(name) as file:
+                image = Image.open(file)
+                assert image.format == image_format
+                assert max(image.size) <= limit
+
+    content = user_client.get('/').content.decode('utf-8')
+    assert default_storage.url(post.image_variants['card.webp']) in content
+    assert default_storage.url(post.image_variants['card.jpg']) in content
+    assert post.image.url in content, (
+        'Убедитесь, что ссылка на оригинал изображения сохранилась.')
+
+
+def test_variant_names_keep_source_extension():
+    assert (variant_name('post/photo.png', 'card', 'jpg')
+            != variant_name('post/photo.jpg', 'card', 'jpg')), (
+        'Убедитесь, что копии изображений с одинаковым именем, но разным '
+        'расширением не перезаписывают друг друга.'
+    )
+
+
+def test_variants_not_created_while_rendering(
+        user_client, mixer, user, published_category, big_image):
+    post = mixer.blend(
+        'blog.Post', author=user, category=published_category,
+        image=big_image,
+        pub_date=datetime.now(tz=pytz.UTC) - timedelta(days=1))
+    name = variant_name(post.image.name, 'detail', 'webp')
+    content = user_client.get(f'/posts/{post.id}/').content.decode('utf-8')
+    assert not default_storage.exists(name), (
+        'Убедитесь, что копии изображения создаются в фоновой задаче, '
+        'а не при отрисовке страницы.'
+    )
+    assert post.image.url in content
+
+
+def test_variants_removed_on_replace_and_delete(
+        user_client, published_category, published_location, big_image,
+        django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        _create_post(
+            user_client, published_category, published_location, big_image)
+    post = Post.objects.get()
+    old_variants = list(post.image_variants.values())
+    buffer = BytesIO()
+    Image.new('RGB', (800, 600)).save(buffer, 'JPEG')
+    with django_capture_on_commit_callbacks(execute=True):
+        user_client.post(f'/posts/{post.id}/edit/', data={
+            'title': post.title,
+            'text': post.text,
+            'pub_date': post.pub_date.strftime('%Y-%m-%d'),
+            'category': published_category.id,
+            'location': published_location.id,
+            'is_published': True,
+            'image': SimpleUploadedFile(
+                'big.jpg', buffer.getvalue(), content_type='image/jpeg'),
+        })
+    post.refresh_from_db()
+    assert not any(default_storage.exists(name) for name in old_variants), (
+        'Убедитесь, что при замене изображения старые копии удаляются.'
+    )
+    new_variants = list(post.image_variants.values())
+    assert new_variants and all(map(default_storage.exists, new_variants))
+    with django_capture_on_commit_callbacks(execute=True):
+        user_client.post(f'/posts/{post.id}/delete/')
+    assert not Post.objects.exists()
+    assert not any(default_storage.exists(name) for name in new_variants), (
+        'Убедитесь, что при удалении публикации копии изображения '
+        'удаляются.'
+    )
+
+
+def test_stale_variant_job_cleans_up(
+        mixer, user, published_category, big_image):
+    post = mixer.blend(
+        'blog.Post', author=user, category=published_category,
+        image=big_image,
+        pub_date=datetime.now(tz=pytz.UTC) - timedelta(days=1))
+    name = post.image.name
+    Post.objects.filter(pk=post.pk).update(image='post/other.png')
+    make_post_image_variants(post.pk, name)
+    post.refresh_from_db()
+    assert post.image_variants == {}
+    assert not default_storage.exists(
+        variant_name(name, 'card', 'jpg')), (
+        'Убедитесь, что копии для уже заменённого изображения не '
+        'остаются в хранилище.'
+    )
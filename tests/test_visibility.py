@@ -0,0 +1,122 @@
+from datetime import datetime, timedelta
+from io import StringIO
+from unittest import mock
+
+import pytest
+import pytz
+from django.conf import settings
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone as tz
+
+from blog.models import Post
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+DB_JSON = settings.BASE_DIR.parent / 'db.json'
+
+
+def _visible_ids():
+    return set(Post.published.values_list('id', flat=True))
+
+
+@pytest.fixture
+def scheduled_post(mixer, user, published_category):
+    return mixer.blend(
+        'blog.Post', author=user, category=published_category,
+        is_published=True,
+        pub_date=datetime.now(tz=pytz.UTC) + timedelta(hours=1))
+
+
+def test_feed_query_is_plain_flag_filter():
+    where = (
+        str(Post.published.all().query)
+        .split(' WHERE ')[1]
+        .split(' ORDER BY ')[0]
+    )
+    assert where.startswith('("blog_post"."is_visible" AND '
+                            '"blog_post"."pub_date" <= '), (
+        'Убедитесь, что лента фильтрует публикации по сохранённому флагу '
+        'видимости и дате публикации, а не пересчитывает видимость '
+        'категории в каждом запросе.'
+    )
+    assert 'blog_category' not in where
+
+
+def test_scheduled_post_appears_without_writes(
+        client, scheduled_post, django_assert_num_queries):
+    url = f'/posts/{scheduled_post.id}/'
+    assert scheduled_post.id not in _visible_ids()
+    assert client.get(url).status_code == 403
+    Post.objects.filter(pk=scheduled_post.pk).update(
+        pub_date=datetime.now(tz=pytz.UTC) - timedelta(minutes=1))
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get('/')
+    assert scheduled_post.title in response.content.decode(), (
+        'Убедитесь, что отложенная публикация появляется в ленте, как '
+        'только наступает её время.'
+    )
+    assert not [
+        query for query in queries.captured_queries
+        if not query['sql'].startswith('SELECT')
+    ], 'Убедитесь, что при чтении ленты не выполняются запросы на запись.'
+    assert client.get(url).status_code == 200
+
+
+def test_post_is_visible_at_exact_pub_date(client, scheduled_post):
+    with mock.patch('django.utils.timezone.now',
+                    return_value=scheduled_post.pub_date):
+        assert scheduled_post.id in _visible_ids()
+        assert client.get(f'/posts/{scheduled_post.id}/').status_code == 200, (
+            'Убедитесь, что публикация, попавшая в ленту, открывается '
+            'и на отдельной странице.'
+        )
+
+
+def test_refresh_visibility_command_repairs_flags(
+        post_with_published_location):
+    post = post_with_published_location
+    Post.objects.filter(pk=post.pk).update(is_visible=False)
+    call_command('refresh_visibility', stdout=StringIO())
+    assert post.id in _visible_ids(), (
+        'Убедитесь, что команда `refresh_visibility` восстанавливает флаг '
+        'видимости публикаций.'
+    )
+
+
+def test_category_flag_controls_visibility(post_with_published_location):
+    post = post_with_published_location
+    category = post.category
+    assert post.id in _visible_ids()
+    category.is_published = False
+    category.save()
+    assert post.id not in _visible_ids(), (
+        'Убедитесь, что при снятии категории с публикации её посты '
+        'пропадают из ленты.'
+    )
+    category.is_published = True
+    category.save()
+    assert post.id in _visible_ids()
+    category.delete()
+    assert post.id not in _visible_ids(), (
+        'Убедитесь, что после удаления категории её посты '
+        'пропадают из ленты.'
+    )
+
+
+def test_loaddata_fills_feed(client):
+    call_command('loaddata', str(DB_JSON), verbosity=0)
+    expected = Post.objects.filter(
+        is_published=True, category__is_published=True,
+        pub_date__lte=tz.now()
+    )
+    assert expected.exists()
+    assert _visible_ids() == set(expected.values_list('id', flat=True)), (
+        'Убедитесь, что после загрузки фикстуры командой `loaddata` '
+        'опубликованные посты показываются в ленте.'
+    )
+    title = expected.order_by('-pub_date').first().title
+    assert title in client.get('/').content.decode('utf-8')